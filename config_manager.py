@@ -5,17 +5,70 @@ Handles saving, loading, and managing task configurations
 """
 
 import os
+import sys
 import json
+import time
+import shutil
+import hashlib
+import functools
 from datetime import datetime
 from typing import Dict, Optional, List
-import inquirer
-from tabulate import tabulate
+
+
+# Python command detected on Windows, remembered across runs so the probe spawns happen once
+_PYTHON_CMD_FILE = os.path.join(os.path.expanduser("~/.task_creator"), "python_cmd")
+
+
+@functools.lru_cache(maxsize=1)
+def get_python_command() -> str:
+    """Get the correct Python command for current OS"""
+    if sys.platform != "win32":
+        return "python3"  # Unix/Linux/macOS
+    
+    # Reuse the command found by an earlier run while it is still on PATH
+    try:
+        with open(_PYTHON_CMD_FILE, 'r') as f:
+            cached = f.read().strip()
+        if cached and shutil.which(cached):
+            return cached
+    except OSError:
+        pass
+    
+    # Test different Python commands on Windows
+    import subprocess
+    python_cmd = "python"  # Default fallback
+    for cmd in ["python", "python3", "py"]:
+        try:
+            result = subprocess.run([cmd, "--version"], capture_output=True, text=True)
+            if result.returncode == 0:
+                python_cmd = cmd
+                break
+        except Exception:
+            continue
+    
+    try:
+        os.makedirs(os.path.dirname(_PYTHON_CMD_FILE), exist_ok=True)
+        with open(_PYTHON_CMD_FILE, 'w') as f:
+            f.write(python_cmd)
+    except OSError:
+        pass
+    return python_cmd
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_saved_at(saved_at: str) -> Optional[datetime]:
+    """Parse a config's saved_at once per distinct value; None if it is not an ISO timestamp"""
+    try:
+        return datetime.fromisoformat(saved_at)
+    except (TypeError, ValueError):
+        return None
 
 
 class ConfigManager:
     def __init__(self):
         self.config_dir = os.path.expanduser("~/.task_creator")
         self.config_file = os.path.join(self.config_dir, "saved_configs.json")
+        self.last_session_file = os.path.join(self.config_dir, "last_session.json")
         self._ensure_config_dir()
     
     def _ensure_config_dir(self):
@@ -75,8 +128,62 @@ class ConfigManager:
             print(f"❌ Error deleting configuration: {e}")
             return False
     
+    def save_last_session(self, config: Dict):
+        """Silently remember the last run's configuration so the next launch can repeat it"""
+        try:
+            payload = json.dumps(config, sort_keys=True, default=str)
+            digest = hashlib.sha1(payload.encode()).hexdigest()
+            
+            # Same answers as last time: just refresh the file's age instead of rewriting it
+            if os.path.exists(self.last_session_file):
+                with open(self.last_session_file, 'r') as f:
+                    if json.load(f).get('hash') == digest:
+                        os.utime(self.last_session_file)
+                        return True
+            
+            with open(self.last_session_file, 'w') as f:
+                json.dump({'hash': digest, 'config': json.loads(payload)}, f, indent=2)
+            return True
+        except Exception as e:
+            print(f"❌ Error saving last session: {e}")
+            return False
+    
+    def load_last_session(self, max_age_days: int = 7) -> Optional[Dict]:
+        """Load the last run's configuration if it is recent enough to offer again"""
+        try:
+            if not os.path.exists(self.last_session_file):
+                return None
+            if time.time() - os.path.getmtime(self.last_session_file) > max_age_days * 86400:
+                return None
+            with open(self.last_session_file, 'r') as f:
+                return json.load(f).get('config') or None
+        except Exception as e:
+            print(f"❌ Error loading last session: {e}")
+            return None
+    
+    def offer_last_session(self) -> Optional[Dict]:
+        """Offer to repeat the last run as-is; returns its configuration if accepted"""
+        import inquirer
+        config = self.load_last_session()
+        if not config:
+            return None
+        
+        groups_info = f"{len(config['groups'])} groups" if config.get('groups') else "All Groups"
+        questions = [
+            inquirer.Confirm('repeat',
+                           message=f"Repeat last session? ({config.get('database', 'N/A')} | {groups_info} | {config.get('report_type', 'N/A')})",
+                           default=True)
+        ]
+        
+        answers = inquirer.prompt(questions)
+        if answers and answers['repeat']:
+            print("✓ Repeating last session configuration")
+            return config
+        return None
+    
     def list_saved_configs(self):
         """List all saved configurations"""
+        from tabulate import tabulate
         saved_configs = self.load_all_configs()
         if not saved_configs:
             print("📁 No saved configurations found")
@@ -88,12 +195,9 @@ class ConfigManager:
         config_data = []
         for name, config in saved_configs.items():
             saved_at = config.get('saved_at', 'Unknown')
-            if saved_at != 'Unknown':
-                try:
-                    saved_dt = datetime.fromisoformat(saved_at)
-                    saved_at = saved_dt.strftime('%Y-%m-%d %H:%M')
-                except:
-                    pass
+            saved_dt = parse_saved_at(saved_at)
+            if saved_dt:
+                saved_at = saved_dt.strftime('%Y-%m-%d %H:%M')
             
             groups_info = "All Groups"
             if config.get('groups'):
@@ -115,6 +219,7 @@ class ConfigManager:
     
     def handle_saved_configs(self, selected_config: Dict) -> bool:
         """Handle loading of saved configurations at startup"""
+        import inquirer
         saved_configs = self.load_all_configs()
         
         if not saved_configs:
@@ -157,6 +262,7 @@ class ConfigManager:
     
     def _load_saved_config(self, selected_config: Dict) -> tuple:
         """Load a saved configuration"""
+        import inquirer
         saved_configs = self.load_all_configs()
         
         if not saved_configs:
@@ -167,12 +273,9 @@ class ConfigManager:
         config_choices = []
         for name, config in saved_configs.items():
             saved_at = config.get('saved_at', 'Unknown')
-            if saved_at != 'Unknown':
-                try:
-                    saved_dt = datetime.fromisoformat(saved_at)
-                    saved_at = saved_dt.strftime('%Y-%m-%d %H:%M')
-                except:
-                    pass
+            saved_dt = parse_saved_at(saved_at)
+            if saved_dt:
+                saved_at = saved_dt.strftime('%Y-%m-%d %H:%M')
             
             groups_info = "All Groups"
             if config.get('groups'):
@@ -224,6 +327,7 @@ class ConfigManager:
     
     def _manage_saved_configs(self, selected_config: Dict) -> tuple:
         """Manage saved configurations"""
+        import inquirer
         while True:
             management_options = [
                 "List All Configurations",
@@ -255,6 +359,7 @@ class ConfigManager:
     
     def _delete_config_interactive(self) -> bool:
         """Interactive configuration deletion"""
+        import inquirer
         saved_configs = self.load_all_configs()
         
         if not saved_configs:
@@ -291,6 +396,7 @@ class ConfigManager:
     
     def offer_save_config(self, selected_config: Dict):
         """Offer to save the current configuration"""
+        import inquirer
         questions = [
             inquirer.Confirm('save',
                            message="Save this configuration for future use?",
@@ -4,18 +4,22 @@ Excel Exporter
 Handles exporting results to Excel with formatting
 """
 
+import io
 import os
+import re
 import subprocess
 import sys
 from datetime import datetime
 from typing import List, Dict
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.utils import get_column_letter
+from config_manager import get_python_command
 
 # Fix Windows encoding issues
 if sys.platform == "win32":
     import codecs
-    import io
     try:
         # Check if stdout has a buffer attribute (not in subprocess environments)
         if hasattr(sys.stdout, 'buffer'):
@@ -26,6 +30,113 @@ if sys.platform == "win32":
         pass  # Keep original stdout/stderr
 
 
+# Numeric-looking report cells, e.g. "1,234", "-56.78", "$1,000.00", "12%"
+_NUM_RE = re.compile(r'^-?\$?([\d,]+)(\.\d+)?%?$')
+
+# Drops currency/percent formatting characters in a single pass
+_STRIP_TABLE = str.maketrans('', '', '$,%')
+
+# Plain integer / decimal strings after formatting characters are stripped
+_INT_RE = re.compile(r'^-?\d+$')
+_FLOAT_RE = re.compile(r'^-?\d+\.\d+$')
+
+# Characters that make up table borders/separator rows
+_SEP_CHARS = frozenset('-|+= ')
+
+# Monthly deals table in deals_categorizer text output: marker line, then "| cell | cell |" rows
+_MONTHLY_MARKER = "Monthly Deals by Login"
+_DEAL_ROW_RE = re.compile(r'^[ \t]*\|([^\n]+?)\|[ \t\r]*$', re.M)
+
+# Control characters removed from group names (tab/newline/carriage return are kept)
+_CTRL_DELETE = dict.fromkeys(i for i in range(32) if i not in (9, 10, 13))
+
+# Null bytes and carriage returns removed by the minimal cell cleaner
+_CLEAN_TABLE = str.maketrans('', '', '\x00\r')
+
+# Shared cell styles for the data sheets (openpyxl style objects are immutable and safe to reuse)
+_TITLE_FONT = Font(bold=True, size=16, color="FFFFFF")
+_TITLE_FILL = PatternFill(start_color="2E4A75", end_color="2E4A75", fill_type="solid")
+_HEADER_FONT = Font(bold=True, size=12, color="FFFFFF")
+_HEADER_FILL = PatternFill(start_color="5B7FA6", end_color="5B7FA6", fill_type="solid")
+_FILL_EVEN = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
+_FILL_ODD = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
+_ALIGN_LEFT = Alignment(horizontal='left', vertical='center')
+_ALIGN_RIGHT = Alignment(horizontal='right', vertical='center')
+_ALIGN_CENTER = Alignment(horizontal='center', vertical='center')
+_THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+# Deals sheet column formats: Login, Year and Deal ID without thousands separator, Profit with decimals
+_DEALS_PROFIT_COL = 6
+_DEALS_COL_FMT = {1: '0', 2: '0', 4: '0', _DEALS_PROFIT_COL: '#,##0.00'}
+_DEALS_COL_ALIGN = {1: _ALIGN_RIGHT, 2: _ALIGN_RIGHT, 4: _ALIGN_RIGHT}
+
+# Login, Year, Month, Deal ID, Category, Profit, Comment, Date, Agent, ZIP
+_DEALS_COLUMN_WIDTHS = [12, 8, 12, 12, 12, 15, 50, 20, 20, 12]
+
+# Summary sheet label column
+_LABEL_FONT = Font(bold=True)
+
+
+class _StreamedSheet:
+    """Row buffer for a write-only worksheet.
+    
+    The sheet builders append to it like a regular worksheet and the _style_*_sheet methods
+    record which style to use, so ExcelExporter._flush_sheet can write pre-styled cells.
+    Every row of the sheet is held here until the flush (column widths need all of them),
+    so this saves openpyxl cell objects, not the rows themselves.
+    """
+    
+    def __init__(self, ws):
+        self.ws = ws
+        self.rows = []
+        self.style = None
+    
+    def append(self, row):
+        self.rows.append(list(row))
+
+
+def _fast_num(value):
+    """Convert a numeric-looking string to int/float, return anything else unchanged"""
+    if type(value) is not str:
+        return value
+    match = _NUM_RE.match(value)
+    if not match:
+        return value
+    digits = match.group(1).replace(',', '')
+    if not digits:
+        return value
+    sign = '-' if value[0] == '-' else ''
+    if match.group(2):
+        return float(sign + digits + match.group(2))
+    return int(sign + digits)
+
+
+def _query_login_groups(database: str, logins: List[int]) -> Dict[int, str]:
+    """Fetch the login-group mapping in one parameterized query"""
+    from database_manager import DatabaseManager
+    
+    db = DatabaseManager()
+    if not db.connect_to_database(database):
+        return {}
+    
+    try:
+        cursor = db.connection.cursor()
+        placeholders = ','.join(('%s',) * len(logins))
+        query = f"SELECT Login, `Group` FROM mt5_users WHERE Login IN ({placeholders})"
+        cursor.execute(query, tuple(logins))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        db.close_connection()
+    
+    return {int(login): group for login, group in rows}
+
+
 class ExcelExporter:
     def __init__(self):
         # Automatically detect correct Python command based on OS
@@ -34,21 +145,9 @@ class ExcelExporter:
     
     def _get_python_command(self):
         """Get the correct Python command for current OS"""
-        if sys.platform == "win32":
-            # Test different Python commands on Windows
-            test_commands = ["python", "python3", "py"]
-            for cmd in test_commands:
-                try:
-                    result = subprocess.run([cmd, "--version"], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        return cmd
-                except:
-                    continue
-            return "python"  # Default fallback
-        else:
-            return "python3"  # Unix/Linux/macOS
+        return get_python_command()
     
-    def export_config_report_to_xlsx(self, config_data: Dict) -> str:
+    def export_config_report_to_xlsx(self, config_data: Dict, streaming: bool = False, sink=None) -> str:
         """
         Export report based on saved configuration to XLSX file.
         Uses config parameters to run daily_report and deals_categorizer, 
@@ -56,9 +155,15 @@ class ExcelExporter:
         
         Args:
             config_data: Dictionary containing configuration parameters
+            streaming: Use a write-only workbook: each sheet's rows are buffered as plain
+                       lists and written as pre-styled cells when the sheet is finished.
+                       Avoids keeping an openpyxl cell object per value, but the rows
+                       are still all in memory until that sheet is flushed
+            sink: Optional binary file object (e.g. io.BytesIO) to save into instead of
+                  writing the file to disk
             
         Returns:
-            str: Filename of the exported Excel file
+            str: Filename of the exported Excel file (suggested name when sink is given)
         """
         try:
             # Get export filename
@@ -70,14 +175,16 @@ class ExcelExporter:
             filename = f"{database}_{config_name}_{timestamp}.xlsx"
             
             # Create workbook
-            wb = Workbook()
+            wb = Workbook(write_only=streaming)
             
-            # Remove default sheet
-            wb.remove(wb.active)
+            # Remove default sheet (write-only workbooks don't have one)
+            if not streaming:
+                wb.remove(wb.active)
             
             # Add summary sheet
-            summary_sheet = wb.create_sheet(title="Summary")
+            summary_sheet = self._new_sheet(wb, "Summary")
             self._create_config_summary_sheet(summary_sheet, config_data)
+            self._flush_sheet(summary_sheet)
             
             # Prepare commands based on configuration
             daily_report_data = None
@@ -106,18 +213,23 @@ class ExcelExporter:
                     print("⚠️ No deals categorizer data received")
             
             # Create Daily Report sheet (always create, even if no data)
-            daily_sheet = wb.create_sheet(title="Daily_Report")
+            daily_sheet = self._new_sheet(wb, "Daily_Report")
             self._create_config_report_sheet(daily_sheet, daily_report_data, "Daily Report")
+            self._flush_sheet(daily_sheet)
             
             # Create Deals Categorizer sheet (always create, even if no data)
-            deals_sheet = wb.create_sheet(title="Deals_Categorizer")
+            deals_sheet = self._new_sheet(wb, "Deals_Categorizer")
             self._create_config_deals_sheet(deals_sheet, deals_categorizer_data, "Deals Categorizer", config_data)
+            self._flush_sheet(deals_sheet)
             
             # Save the workbook
-            wb.save(filename)
-            
-            print(f"✓ Config report exported to: {filename}")
-            print(f"📁 File saved in: {os.path.abspath(filename)}")
+            if sink is not None:
+                wb.save(sink)
+                print(f"✓ Config report exported in memory: {filename}")
+            else:
+                wb.save(filename)
+                print(f"✓ Config report exported to: {filename}")
+                print(f"📁 File saved in: {os.path.abspath(filename)}")
             
             # Show sheet summary
             sheet_count = len(wb.sheetnames)
@@ -355,38 +467,8 @@ class ExcelExporter:
         
         # Add all data to worksheet
         if parsed_data:
-            # Sort by Net P/L column if it exists
-            if len(parsed_data) > 1:  # Skip header row
-                header_row = parsed_data[0]
-                data_rows = parsed_data[1:]
-                
-                # Find Net P/L column index
-                net_pl_index = None
-                for i, header in enumerate(header_row):
-                    if 'Net P/L' in str(header):
-                        net_pl_index = i
-                        break
-                
-                # Sort by Net P/L if found (ascending - from low to high)
-                if net_pl_index is not None:
-                    try:
-                        def get_net_pl_value(row):
-                            if len(row) <= net_pl_index or not row[net_pl_index]:
-                                return 0
-                            try:
-                                # Clean the value and convert to float
-                                cleaned = str(row[net_pl_index]).replace('$', '').replace(',', '').strip()
-                                return float(cleaned)
-                            except (ValueError, TypeError):
-                                return 0
-                        
-                        data_rows.sort(key=get_net_pl_value, reverse=False)
-                    except (ValueError, IndexError):
-                        # If sorting fails, just keep original order
-                        pass
-                
-                # Rebuild parsed_data with sorted rows
-                parsed_data = [header_row] + data_rows
+            # Type the whole table once - sorting and styling reuse the converted values
+            parsed_data = self._sort_rows_by_net_pl([[_fast_num(value) for value in row] for row in parsed_data])
             
             for row_data in parsed_data:
                 ws.append(row_data)
@@ -398,6 +480,30 @@ class ExcelExporter:
             ws.append(["No structured data found in the report output"])
             print("⚠️ No structured data found in the report output")
     
+    def _sort_rows_by_net_pl(self, rows: List[List]) -> List[List]:
+        """Sort typed data rows by the Net P/L column (ascending), keeping the header row first"""
+        if len(rows) <= 1:
+            return rows
+        
+        header_row = rows[0]
+        net_pl_index = None
+        for i, header in enumerate(header_row):
+            if 'Net P/L' in str(header):
+                net_pl_index = i
+                break
+        
+        if net_pl_index is None:
+            return rows
+        
+        def get_net_pl_value(row):
+            if len(row) <= net_pl_index:
+                return 0
+            value = row[net_pl_index]
+            # Non-numeric cells (already converted by _fast_num) sort as zero
+            return value if type(value) in (int, float) else 0
+        
+        return [header_row] + sorted(rows[1:], key=get_net_pl_value)
+    
     def _create_config_deals_sheet(self, ws, output_data: str, report_title: str, config_data: Dict = None):
         """Create deals sheet from deals_categorizer output"""
         # Add title
@@ -509,8 +615,10 @@ class ExcelExporter:
         
         return filtered_deals
     
-    def export_results_to_xlsx(self, results: List[Dict], config: Dict) -> str:
-        """Export results to XLSX file with organized sheets and return filename"""
+    def export_results_to_xlsx(self, results: List[Dict], config: Dict, streaming: bool = False, sink=None) -> str:
+        """Export results to XLSX file with organized sheets and return filename, or None on failure.
+        With streaming=True a write-only workbook is used, and with a sink the workbook is saved
+        into that file object instead of to disk (see export_config_report_to_xlsx)."""
         try:
             # Get export filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -525,14 +633,16 @@ class ExcelExporter:
             filename = "_".join(filename_parts) + ".xlsx"
             
             # Create workbook
-            wb = Workbook()
+            wb = Workbook(write_only=streaming)
             
-            # Remove default sheet
-            wb.remove(wb.active)
+            # Remove default sheet (write-only workbooks don't have one)
+            if not streaming:
+                wb.remove(wb.active)
             
             # Add summary sheet
-            summary_sheet = wb.create_sheet(title="Summary")
+            summary_sheet = self._new_sheet(wb, "Summary")
             self._create_summary_sheet(summary_sheet, results, config)
+            self._flush_sheet(summary_sheet)
             
             # Organize results by type
             daily_report_results = []
@@ -546,25 +656,31 @@ class ExcelExporter:
             
             # Create Daily Report sheet
             if daily_report_results:
-                daily_sheet = wb.create_sheet(title="Daily_Report")
+                daily_sheet = self._new_sheet(wb, "Daily_Report")
                 self._create_report_sheet(daily_sheet, daily_report_results, "Daily Report")
+                self._flush_sheet(daily_sheet)
             
             # Create Deals Categorizer sheet with deal-by-deal data
             if deals_categorizer_results:
-                deals_sheet = wb.create_sheet(title="Deals_Categorizer")
+                deals_sheet = self._new_sheet(wb, "Deals_Categorizer")
                 self._create_deals_detailed_sheet(deals_sheet, deals_categorizer_results, "Deals Categorizer")
+                self._flush_sheet(deals_sheet)
             
             # If no specific type identified, create generic sheets
             other_results = [r for r in results if 'daily_report.py' not in r['command'] and 'deals_categorizer.py' not in r['command']]
             if other_results:
-                other_sheet = wb.create_sheet(title="Other_Reports")
+                other_sheet = self._new_sheet(wb, "Other_Reports")
                 self._create_report_sheet(other_sheet, other_results, "Other Reports")
+                self._flush_sheet(other_sheet)
             
             # Save the workbook
-            wb.save(filename)
-            
-            print(f"✓ Results exported to: {filename}")
-            print(f"📁 File saved in: {os.path.abspath(filename)}")
+            if sink is not None:
+                wb.save(sink)
+                print(f"✓ Results exported in memory: {filename}")
+            else:
+                wb.save(filename)
+                print(f"✓ Results exported to: {filename}")
+                print(f"📁 File saved in: {os.path.abspath(filename)}")
             
             # Show sheet summary
             sheet_count = len(wb.sheetnames)
@@ -621,38 +737,8 @@ class ExcelExporter:
         
         # Add all data to worksheet
         if all_data:
-            # Sort by Net P/L column if it exists
-            if len(all_data) > 1:  # Skip header row
-                header_row = all_data[0]
-                data_rows = all_data[1:]
-                
-                # Find Net P/L column index
-                net_pl_index = None
-                for i, header in enumerate(header_row):
-                    if 'Net P/L' in str(header):
-                        net_pl_index = i
-                        break
-                
-                # Sort by Net P/L if found (ascending - from low to high)
-                if net_pl_index is not None:
-                    try:
-                        def get_net_pl_value(row):
-                            if len(row) <= net_pl_index or not row[net_pl_index]:
-                                return 0
-                            try:
-                                # Clean the value and convert to float
-                                cleaned = str(row[net_pl_index]).replace('$', '').replace(',', '').strip()
-                                return float(cleaned)
-                            except (ValueError, TypeError):
-                                return 0
-                        
-                        data_rows.sort(key=get_net_pl_value, reverse=False)
-                    except (ValueError, IndexError):
-                        # If sorting fails, just keep original order
-                        pass
-                
-                # Rebuild all_data with sorted rows
-                all_data = [header_row] + data_rows
+            # Type the whole table once - sorting and styling reuse the converted values
+            all_data = self._sort_rows_by_net_pl([[_fast_num(value) for value in row] for row in all_data])
             
             for row_data in all_data:
                 ws.append(row_data)
@@ -708,10 +794,10 @@ class ExcelExporter:
         if not output:
             return []
         
-        lines = output.strip().split('\n')
         parsed_data = []
         
-        for line in lines:
+        # Iterate the captured output lazily instead of materializing a line list
+        for line in io.StringIO(output):
             if not line:
                 continue
             
@@ -741,14 +827,15 @@ class ExcelExporter:
             
             # Look for pipe-separated table data (primary format)
             if '|' in line:
+                # Skip separator lines (only dashes/pipes/spaces)
+                if not set(line) - _SEP_CHARS:
+                    continue
                 cells = [cell.strip() if cell else '' for cell in line.split('|')]
                 cells = [cell for cell in cells if cell]  # Remove empty cells
                 if cells and len(cells) > 1:
-                    # Skip separator lines (all dashes/spaces)
-                    if not all(c.replace('-', '').replace(' ', '') == '' for c in cells):
-                        # Apply minimal cell cleaning
-                        cells = self._clean_cell_data_minimal(cells)
-                        parsed_data.append(cells)
+                    # Apply minimal cell cleaning
+                    cells = self._clean_cell_data_minimal(cells)
+                    parsed_data.append(cells)
             
             # Look for CSV format data as fallback
             elif ',' in line and len(line.split(',')) > 2:
@@ -773,62 +860,55 @@ class ExcelExporter:
         except (json.JSONDecodeError, KeyError):
             pass
             
-        # Fall back to table parsing
-        lines = output.strip().split('\n')
+        # Fall back to table parsing - jump straight to the monthly deals table
         deals = []
-        in_monthly_table = False
+        table_start = output.find(_MONTHLY_MARKER)
+        if table_start == -1:
+            return deals
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        # Only "| ... |" rows are matched, so borders and blank lines are never materialized
+        for match in _DEAL_ROW_RE.finditer(output, table_start):
+            row = match.group(1)
             
-            # Look for the monthly deals table header
-            if "Monthly Deals by Login" in line:
-                in_monthly_table = True
+            # Skip separator rows
+            if not set(row) - _SEP_CHARS:
                 continue
             
-            # Skip table borders and separators
-            if line.startswith('=') or line.startswith('-') or line.startswith('+'):
-                continue
+            cells = [cell.strip() for cell in row.split('|')]
+            # Remove empty cells
+            cells = [cell for cell in cells if cell]
             
-            # Parse table data if we're in the monthly deals section
-            if in_monthly_table and '|' in line:
-                cells = [cell.strip() for cell in line.split('|')]
-                # Remove empty cells from edges
-                cells = [cell for cell in cells if cell]
+            # Skip header row
+            if len(cells) >= 10 and cells[0] != 'Login':
                 
-                # Skip header row and separator rows
-                if (len(cells) >= 10 and 
-                    cells[0] != 'Login' and 
-                    not all(c.replace('-', '').replace(' ', '') == '' for c in cells)):
-                    
-                    try:
-                        # Parse the deal data - now including agent and zip
-                        deal = {
-                            'login': int(cells[0]) if cells[0].isdigit() else cells[0],
-                            'year': int(cells[1]) if cells[1].isdigit() else cells[1],
-                            'month_name': cells[2],
-                            'deal_id': int(cells[3]) if cells[3].isdigit() else cells[3],
-                            'category': cells[4],
-                            'profit': self._clean_numeric_value(cells[5]),
-                            'comment': cells[6],
-                            'date': cells[7] if len(cells) > 7 else '',
-                            'agent': cells[8] if len(cells) > 8 else '',
-                            'zip_code': cells[9] if len(cells) > 9 else ''
-                        }
-                        deals.append(deal)
-                    except (ValueError, IndexError):
-                        # Skip malformed rows
-                        continue
+                try:
+                    # Parse the deal data - now including agent and zip
+                    deal = {
+                        'login': int(cells[0]) if cells[0].isdigit() else cells[0],
+                        'year': int(cells[1]) if cells[1].isdigit() else cells[1],
+                        'month_name': cells[2],
+                        'deal_id': int(cells[3]) if cells[3].isdigit() else cells[3],
+                        'category': cells[4],
+                        'profit': self._clean_numeric_value(cells[5]),
+                        'comment': cells[6],
+                        'date': cells[7] if len(cells) > 7 else '',
+                        'agent': cells[8] if len(cells) > 8 else '',
+                        'zip_code': cells[9] if len(cells) > 9 else ''
+                    }
+                    deals.append(deal)
+                except (ValueError, IndexError):
+                    # Skip malformed rows
+                    continue
         
         return deals
     
     def _is_numeric_like(self, text: str) -> bool:
         """Check if text looks like a numeric value"""
+        if not text or text[0].isalpha():
+            return False
         try:
             # Remove common currency symbols and formatting
-            cleaned = text.replace('$', '').replace(',', '').replace('%', '')
+            cleaned = text.translate(_STRIP_TABLE)
             float(cleaned)
             return True
         except ValueError:
@@ -838,25 +918,25 @@ class ExcelExporter:
         """Clean and convert string values to proper numeric types"""
         if not isinstance(value, str):
             return value
+        if not value or value[0].isalpha():
+            return value  # Fast path for plain text
         
         # Remove common currency symbols and formatting
-        cleaned = value.replace('$', '').replace(',', '').replace('%', '').strip()
-        
-        # Try to convert to number
-        try:
-            # Check if it's an integer
-            if '.' not in cleaned and cleaned.isdigit():
-                return int(cleaned)
-            # Check if it's a float
-            elif cleaned.replace('.', '').replace('-', '').isdigit():
-                return float(cleaned)
-            else:
-                return value  # Return original if not a number
-        except:
-            return value  # Return original if conversion fails
+        cleaned = value.translate(_STRIP_TABLE).strip()
+        
+        # Classify with precompiled patterns instead of try/except
+        if _INT_RE.match(cleaned):
+            return int(cleaned)
+        if _FLOAT_RE.match(cleaned):
+            return float(cleaned)
+        return value  # Return original if not a number
     
     def _style_simple_summary_sheet(self, ws):
         """Style the simple summary sheet"""
+        if isinstance(ws, _StreamedSheet):
+            ws.style = 'summary'  # Applied when the rows are written
+            return
+        
         # Title styling
         title_cell = ws.cell(row=1, column=1)
         title_cell.font = Font(bold=True, size=16, color="FFFFFF")
@@ -884,178 +964,206 @@ class ExcelExporter:
     
     def _style_clean_data_sheet(self, ws, report_title: str):
         """Style the clean data sheet with headers and proper number formatting"""
+        if isinstance(ws, _StreamedSheet):
+            ws.style = 'clean'  # Applied when the rows are written
+            return
+        
         if ws.max_row < 3:
             return
         
         # Title styling
-        title_cell = ws.cell(row=1, column=1)
-        title_cell.font = Font(bold=True, size=16, color="FFFFFF")
-        title_cell.fill = PatternFill(start_color="2E4A75", end_color="2E4A75", fill_type="solid")
+        self._style_title_cell(ws.cell(row=1, column=1))
         
-        # Find the maximum column count
-        max_col = 1
-        for row in range(3, ws.max_row + 1):
-            row_cells = [cell for cell in ws[row] if cell.value is not None]
-            if row_cells:
-                max_col = max(max_col, len(row_cells))
+        # Single pass over the values: maximum column count and content width per column
+        max_col, col_widths = self._measure_columns(ws.iter_rows(min_row=3, values_only=True))
         
         # Style the first data row as headers (row 3)
         if ws.max_row >= 3:
-            for col in range(1, max_col + 1):
-                header_cell = ws.cell(row=3, column=col)
-                header_cell.font = Font(bold=True, size=12, color="FFFFFF")
-                header_cell.fill = PatternFill(start_color="5B7FA6", end_color="5B7FA6", fill_type="solid")
-                header_cell.alignment = Alignment(horizontal='center', vertical='center')
+            for header_row in ws.iter_rows(min_row=3, max_row=3, max_col=max_col):
+                for header_cell in header_row:
+                    self._style_header_cell(header_cell)
         
         # Style data rows with alternating colors and proper number formatting
-        for row in range(4, ws.max_row + 1):
-            fill_color = "F2F2F2" if row % 2 == 0 else "FFFFFF"
-            for col in range(1, max_col + 1):
-                cell = ws.cell(row=row, column=col)
-                cell.fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
-                cell.alignment = Alignment(horizontal='left', vertical='center')
-                
-                # Convert numeric values and format them
-                if cell.value and isinstance(cell.value, str):
-                    cleaned_value = self._clean_numeric_value(cell.value)
-                    if cleaned_value is not None:
-                        cell.value = cleaned_value
-                        # Format based on the type of number and column
-                        if isinstance(cleaned_value, float):
-                            cell.number_format = '#,##0.00'
-                        elif isinstance(cleaned_value, int):
-                            # Don't add thousands separator for Login column (column 1)
-                            if col == 1:
-                                cell.number_format = '0'  # No thousands separator for Login
-                            else:
-                                cell.number_format = '#,##0'
-        
-        # Add borders to all data
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        for row in range(3, ws.max_row + 1):
-            for col in range(1, max_col + 1):
-                cell = ws.cell(row=row, column=col)
-                cell.border = thin_border
+        for row, row_cells in enumerate(ws.iter_rows(min_row=4, max_col=max_col), start=4):
+            fill = _FILL_EVEN if row % 2 == 0 else _FILL_ODD
+            for col, cell in enumerate(row_cells, start=1):
+                self._style_clean_data_cell(cell, col, fill)
         
         # Auto-adjust column widths with specific handling for Group column
-        for col in range(1, max_col + 1):
-            max_width = 0
-            for row in range(3, ws.max_row + 1):
-                cell = ws.cell(row=row, column=col)
-                if cell.value:
-                    max_width = max(max_width, len(str(cell.value)))
-            
-            # Set column width (with some padding)
-            column_letter = ws.cell(row=1, column=col).column_letter
-            
-            # Special handling for Group column (typically column 3)
-            if col == 3:
-                # Ensure Group column has adequate width (minimum 20, maximum 60)
-                ws.column_dimensions[column_letter].width = min(max(max_width + 5, 20), 60)
-            else:
-                ws.column_dimensions[column_letter].width = min(max_width + 3, 50)
+        self._set_clean_data_widths(ws, max_col, col_widths)
     
     def _style_deals_data_sheet(self, ws, report_title: str):
         """Style the deals data sheet with proper formatting"""
+        if isinstance(ws, _StreamedSheet):
+            ws.style = 'deals'  # Applied when the rows are written
+            return
+        
         if ws.max_row < 3:
             return
         
         # Title styling
-        title_cell = ws.cell(row=1, column=1)
-        title_cell.font = Font(bold=True, size=16, color="FFFFFF")
-        title_cell.fill = PatternFill(start_color="2E4A75", end_color="2E4A75", fill_type="solid")
+        self._style_title_cell(ws.cell(row=1, column=1))
         
         # Find the maximum column count
-        max_col = 10  # We now have 10 columns for deals (added agent and zip)
+        max_col = len(_DEALS_COLUMN_WIDTHS)
         
         # Style the header row (row 3)
         if ws.max_row >= 3:
-            for col in range(1, max_col + 1):
-                header_cell = ws.cell(row=3, column=col)
-                header_cell.font = Font(bold=True, size=12, color="FFFFFF")
-                header_cell.fill = PatternFill(start_color="5B7FA6", end_color="5B7FA6", fill_type="solid")
-                header_cell.alignment = Alignment(horizontal='center', vertical='center')
+            for header_row in ws.iter_rows(min_row=3, max_row=3, max_col=max_col):
+                for header_cell in header_row:
+                    self._style_header_cell(header_cell)
         
         # Style data rows with alternating colors and proper number formatting
-        for row in range(4, ws.max_row + 1):
-            fill_color = "F2F2F2" if row % 2 == 0 else "FFFFFF"
-            for col in range(1, max_col + 1):
-                cell = ws.cell(row=row, column=col)
-                cell.fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
-                cell.alignment = Alignment(horizontal='left', vertical='center')
-                
-                # Special formatting for specific columns
-                if col == 6:  # Profit column
-                    if cell.value and isinstance(cell.value, (int, float)):
-                        if cell.value >= 1000 or cell.value <= -1000:
-                            cell.number_format = '#,##0.00'
-                        else:
-                            cell.number_format = '0.00'
-                elif col in [1, 4]:  # Login and Deal ID columns - no thousands separator
-                    if cell.value and isinstance(cell.value, int):
-                        cell.number_format = '0'  # No thousands separator
-                        cell.alignment = Alignment(horizontal='right', vertical='center')
-                elif col == 2:  # Year column
-                    if cell.value and isinstance(cell.value, int):
-                        cell.number_format = '0'  # No thousands separator for year
-                        cell.alignment = Alignment(horizontal='right', vertical='center')
-        
-        # Add borders to all data
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        for row, row_cells in enumerate(ws.iter_rows(min_row=4, max_col=max_col), start=4):
+            fill = _FILL_EVEN if row % 2 == 0 else _FILL_ODD
+            for col, cell in enumerate(row_cells, start=1):
+                self._style_deals_data_cell(cell, col, fill)
         
-        for row in range(3, ws.max_row + 1):
-            for col in range(1, max_col + 1):
-                cell = ws.cell(row=row, column=col)
-                cell.border = thin_border
-        
-        # Set column widths - added agent and zip columns
-        column_widths = [12, 8, 12, 12, 12, 15, 50, 20, 20, 12]  # Login, Year, Month, Deal ID, Category, Profit, Comment, Date, Agent, ZIP
-        for i, width in enumerate(column_widths, 1):
-            column_letter = ws.cell(row=1, column=i).column_letter
+        self._set_deals_data_widths(ws)
+    
+    def _style_title_cell(self, cell):
+        """Style the sheet title cell"""
+        cell.font = _TITLE_FONT
+        cell.fill = _TITLE_FILL
+    
+    def _style_header_cell(self, cell):
+        """Style a table header cell"""
+        cell.font = _HEADER_FONT
+        cell.fill = _HEADER_FILL
+        cell.alignment = _ALIGN_CENTER
+        cell.border = _THIN_BORDER
+    
+    def _style_clean_data_cell(self, cell, col: int, fill):
+        """Style a report data cell; values were already converted by _fast_num, so only the format is set"""
+        cell.fill = fill
+        cell.alignment = _ALIGN_LEFT
+        cell.border = _THIN_BORDER
+        
+        value_type = type(cell.value)
+        if value_type is float:
+            cell.number_format = '#,##0.00'
+        elif value_type is int:
+            # Don't add thousands separator for Login column (column 1)
+            if col == 1:
+                cell.number_format = '0'  # No thousands separator for Login
+            else:
+                cell.number_format = '#,##0'
+    
+    def _style_deals_data_cell(self, cell, col: int, fill):
+        """Style a deals data cell"""
+        cell.fill = fill
+        cell.alignment = _ALIGN_LEFT
+        cell.border = _THIN_BORDER
+        
+        # Special formatting for specific columns (see _DEALS_COL_FMT)
+        fmt = _DEALS_COL_FMT.get(col)
+        value = cell.value
+        if fmt and value:
+            if col == _DEALS_PROFIT_COL:
+                if isinstance(value, (int, float)):
+                    # Thousands separator only for large amounts
+                    cell.number_format = fmt if value >= 1000 or value <= -1000 else '0.00'
+            elif isinstance(value, int):
+                cell.number_format = fmt
+                cell.alignment = _DEALS_COL_ALIGN[col]
+    
+    def _measure_columns(self, rows) -> tuple:
+        """Get the maximum filled-column count and the content width per column index"""
+        max_col = 1
+        col_widths = {}
+        for row_values in rows:
+            filled = 0
+            for i, value in enumerate(row_values):
+                if value is None:
+                    continue
+                filled += 1
+                if value:
+                    width = len(str(value))
+                    if width > col_widths.get(i, 0):
+                        col_widths[i] = width
+            if filled > max_col:
+                max_col = filled
+        return max_col, col_widths
+    
+    def _set_clean_data_widths(self, ws, max_col: int, col_widths: Dict[int, int]):
+        """Set report column widths from measured content widths"""
+        for col in range(1, max_col + 1):
+            max_width = col_widths.get(col - 1, 0)
+            
+            # Set column width (with some padding)
+            column_letter = get_column_letter(col)
+            
+            # Special handling for Group column (typically column 3)
+            if col == 3:
+                # Ensure Group column has adequate width (minimum 20, maximum 60)
+                ws.column_dimensions[column_letter].width = min(max(max_width + 5, 20), 60)
+            else:
+                ws.column_dimensions[column_letter].width = min(max_width + 3, 50)
+    
+    def _set_deals_data_widths(self, ws):
+        """Set the fixed deals sheet column widths"""
+        for i, width in enumerate(_DEALS_COLUMN_WIDTHS, 1):
+            column_letter = get_column_letter(i)
             ws.column_dimensions[column_letter].width = width
     
+    def _new_sheet(self, wb, title: str):
+        """Create a worksheet; write-only workbooks get a row buffer that is written by _flush_sheet"""
+        ws = wb.create_sheet(title=title)
+        if wb.write_only:
+            return _StreamedSheet(ws)
+        return ws
+    
+    def _flush_sheet(self, sheet):
+        """Write a buffered write-only sheet as pre-styled cells (no-op for regular worksheets)"""
+        if not isinstance(sheet, _StreamedSheet):
+            return
+        
+        ws, rows, style = sheet.ws, sheet.rows, sheet.style
+        sheet.rows = []
+        if style is None:
+            for row in rows:
+                ws.append(row)
+            return
+        
+        # Column widths must be set before the first row is written
+        if style == 'summary':
+            styled_cols = 2
+            ws.column_dimensions['A'].width = 15
+            ws.column_dimensions['B'].width = 30
+        elif style == 'clean':
+            styled_cols, col_widths = self._measure_columns(rows[2:])
+            self._set_clean_data_widths(ws, styled_cols, col_widths)
+        else:
+            styled_cols = len(_DEALS_COLUMN_WIDTHS)
+            self._set_deals_data_widths(ws)
+        
+        for row_idx, values in enumerate(rows, start=1):
+            if row_idx >= 3 and len(values) < styled_cols:
+                values = values + [None] * (styled_cols - len(values))
+            cells = [WriteOnlyCell(ws, value=value) for value in values]
+            
+            if row_idx == 1 and cells:
+                self._style_title_cell(cells[0])
+            elif row_idx >= 3:
+                fill = _FILL_EVEN if row_idx % 2 == 0 else _FILL_ODD
+                for col, cell in enumerate(cells[:styled_cols], start=1):
+                    if style == 'summary':
+                        cell.border = _THIN_BORDER
+                        if col == 1:
+                            cell.font = _LABEL_FONT
+                    elif row_idx == 3:
+                        self._style_header_cell(cell)
+                    elif style == 'clean':
+                        self._style_clean_data_cell(cell, col, fill)
+                    else:
+                        self._style_deals_data_cell(cell, col, fill)
+            
+            ws.append(cells)
+    
     def _get_login_group_mapping(self, database: str, logins: List[int]) -> Dict[int, str]:
         """Get login-group mapping from database"""
         try:
-            from database_manager import DatabaseManager
-            
-            db = DatabaseManager()
-            success = db.connect_to_database(database)
-            if not success:
-                return {}
-            
-            connection = db.connection
-            cursor = connection.cursor()
-            
-            # Convert logins to a comma-separated string for IN clause
-            login_list = ','.join(str(login) for login in logins)
-            
-            # Get login-group mapping
-            query = f"SELECT Login, `Group` FROM mt5_users WHERE Login IN ({login_list})"
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            
-            # Build mapping dictionary
-            mapping = {}
-            for row in rows:
-                mapping[int(row[0])] = row[1]
-            
-            cursor.close()
-            db.close_connection()
-            
-            return mapping
-            
+            return _query_login_groups(database, logins)
         except Exception as e:
             print(f"❌ Error getting login-group mapping: {e}")
             return {}
@@ -1072,7 +1180,7 @@ class ExcelExporter:
         cleaned = cleaned.strip()
         
         # Remove any null characters or control characters
-        cleaned = ''.join(char for char in cleaned if ord(char) >= 32 or char in '\t\n\r')
+        cleaned = cleaned.translate(_CTRL_DELETE)
         
         return cleaned
 
@@ -1080,9 +1188,11 @@ class ExcelExporter:
         """Clean withdrawal values and make them negative"""
         if not isinstance(value, str):
             return value
+        if not value or value[0].isalpha():
+            return value  # Fast path for plain text
         
         # Remove currency symbols and clean the value
-        cleaned = value.replace('$', '').replace(',', '').strip()
+        cleaned = value.translate(_STRIP_TABLE).strip()
         
         # Try to convert to number and make negative
         try:
@@ -1126,21 +1236,13 @@ class ExcelExporter:
     
     def _clean_cell_data_minimal(self, cells: List[str]) -> List[str]:
         """Minimal cell cleaning - only basic formatting with group column special handling"""
-        cleaned_cells = []
-        
-        for i, cell in enumerate(cells):
-            if cell is None:
-                cleaned_cells.append('')
-            elif isinstance(cell, str):
-                # Only basic cleaning - remove excessive whitespace and null characters
-                cleaned = cell.strip().replace('\x00', '').replace('\r', '')
-                
-                # Special handling for Group column (typically column 3, index 2)
-                if i == 2:
-                    cleaned = self._clean_group_data(cleaned)
-                
-                cleaned_cells.append(cleaned)
-            else:
-                cleaned_cells.append(str(cell) if cell is not None else '')
-        
-        return cleaned_cells
\ No newline at end of file
+        # Remove null characters/carriage returns and excess whitespace; the Group
+        # column (typically column 3, index 2) also gets _clean_group_data
+        clean_group = self._clean_group_data
+        return [
+            '' if cell is None
+            else str(cell) if not isinstance(cell, str)
+            else clean_group(cell.translate(_CLEAN_TABLE).strip()) if i == 2
+            else cell.translate(_CLEAN_TABLE).strip()
+            for i, cell in enumerate(cells)
+        ]
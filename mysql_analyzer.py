@@ -63,14 +63,41 @@ def get_tables_list(connection):
         print(f"Error getting tables list: {e}")
         return []
 
-def analyze_table_structure(connection, table_name):
-    """Analyze the structure of a specific table"""
+def get_schema_metadata(connection):
+    """Get column definitions and row counts for all tables (one query each instead of two per table)"""
+    columns_by_table = {}
+    row_counts = {}
     try:
         cursor = connection.cursor()
         
-        # Get table structure
-        cursor.execute(f"DESCRIBE {table_name}")
-        columns = cursor.fetchall()
+        # Row counts from table statistics (approximate for InnoDB, but no full table scans)
+        cursor.execute("""
+        SELECT TABLE_NAME, TABLE_ROWS
+        FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = %s
+        """, (DB_CONFIG['database'],))
+        row_counts = {table_name: rows or 0 for table_name, rows in cursor.fetchall()}
+        
+        # Column definitions in DESCRIBE order: Field, Type, Null, Key, Default, Extra
+        cursor.execute("""
+        SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT, EXTRA
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = %s
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """, (DB_CONFIG['database'],))
+        for table_name, *column in cursor.fetchall():
+            columns_by_table.setdefault(table_name, []).append(column)
+        
+        cursor.close()
+    except Error as e:
+        print(f"Error getting schema metadata: {e}")
+    
+    return columns_by_table, row_counts
+
+def analyze_table_structure(connection, table_name, columns, row_count):
+    """Analyze the structure of a specific table using prefetched schema metadata"""
+    try:
+        cursor = connection.cursor()
         
         print(f"\n{'='*60}")
         print(f"TABLE: {table_name}")
@@ -84,33 +111,24 @@ def analyze_table_structure(connection, table_name):
             field, col_type, null, key, default, extra = col
             default_str = str(default) if default is not None else "NULL"
             extra_str = str(extra) if extra is not None else ""
-            print(f"{field:<20} {str(col_type):<20} {null:<5} {key:<5} {default_str:<10} {extra_str}")
+            print(f"{field:<20} {str(col_type):<20} {str(null):<5} {str(key):<5} {default_str:<10} {extra_str}")
         
-        # Get row count
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        row_count = cursor.fetchone()[0]
-        print(f"\nTotal rows: {row_count:,}")
+        print(f"\nTotal rows (approx.): {row_count:,}")
         
-        # Get sample data (first 3 rows)
-        cursor.execute(f"SELECT * FROM {table_name} LIMIT 3")
-        sample_data = cursor.fetchall()
+        # Get sample data (first 3 rows) - quote the identifier instead of interpolating it raw
+        quoted_name = table_name.replace('`', '``')
+        cursor.execute(f"SELECT * FROM `{quoted_name}` LIMIT 3")
+        sample_data = cursor.fetchall()  # LIMIT 3 already bounds this; fetchmany would leave the EOF unread
         
         if sample_data:
             print(f"\nSample data (first 3 rows):")
             column_names = [desc[0] for desc in cursor.description]
             
-            # Create a simple table display
-            print("\n" + " | ".join(f"{col[:15]:<15}" for col in column_names))
-            print("-" * (len(column_names) * 17))
-            
+            # Create a simple table display, buffered and written in one call
+            out = ["", " | ".join(f"{col[:15]:<15}" for col in column_names), "-" * (len(column_names) * 17)]
             for row in sample_data:
-                row_strs = []
-                for val in row:
-                    if val is None:
-                        row_strs.append("NULL".ljust(15))
-                    else:
-                        row_strs.append(str(val)[:15].ljust(15))
-                print(" | ".join(row_strs))
+                out.append(" | ".join("NULL".ljust(15) if val is None else str(val)[:15].ljust(15) for val in row))
+            sys.stdout.write("\n".join(out) + "\n")
         
         cursor.close()
         
@@ -216,8 +234,9 @@ def main():
         print("DETAILED TABLE ANALYSIS")
         print(f"{'='*60}")
         
+        columns_by_table, row_counts = get_schema_metadata(connection)
         for table in tables:
-            analyze_table_structure(connection, table)
+            analyze_table_structure(connection, table, columns_by_table.get(table, []), row_counts.get(table, 0))
         
         # Get relationships
         get_table_relationships(connection)
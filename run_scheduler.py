@@ -12,7 +12,7 @@ sys.path.insert(0, current_dir)
 
 # Import and run the scheduler
 try:
-    from scheduler import main
+    from scheduler_cli import main
     
     if __name__ == "__main__":
         print("🚀 Starting Scheduled Task Manager...")
@@ -4,258 +4,406 @@ Scheduled Task Manager
 Manages scheduled tasks for sending reports to different Telegram groups at specified times
 """
 
+import io
 import os
+import atexit
 import json
+import functools
+import heapq
+import sqlite3
+import signal
 import asyncio
-import schedule
 import time
 import threading
-import sys
-import subprocess
+import concurrent.futures
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import inquirer
 from telegram_bot import TelegramIntegration
-from config_manager import ConfigManager
+from config_manager import ConfigManager, get_python_command
+from excel_exporter import ExcelExporter
+
+try:
+    import orjson  # optional, faster task (de)serialization
+except ImportError:
+    orjson = None
+
+
+def _dumps_task(task: dict) -> str:
+    """Serialize one task to compact JSON text"""
+    if orjson is not None:
+        return orjson.dumps(task).decode()
+    return json.dumps(task, separators=(',', ':'))
+
+
+def _loads_task(data: str) -> dict:
+    """Parse one task from JSON text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Fields every task must carry, and defaults filled in once at load time
+_TASK_REQUIRED_FIELDS = ('report_type', 'chat_id', 'send_time', 'frequency')
+_TASK_DEFAULTS = {
+    'description': '',
+    'database': 'Unknown',
+    'active': False,
+    'last_run': None,
+    'next_run': None,
+    'run_count': 0,
+    'success_count': 0,
+    'error_count': 0,
+    'last_error': None,
+}
+
+
+def _normalize_task(task_name: str, task: dict) -> Optional[str]:
+    """Fill task defaults in place; return a reason string if the task is unusable"""
+    if not isinstance(task, dict):
+        return "not a task record"
+    missing = [field for field in _TASK_REQUIRED_FIELDS if not task.get(field)]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    
+    time_parts = str(task['send_time']).split(':')
+    if len(time_parts) != 2 or not all(part.isdigit() for part in time_parts):
+        return f"invalid send time {task['send_time']!r}"
+    
+    task.setdefault('task_name', task_name)
+    for field, default in _TASK_DEFAULTS.items():
+        task.setdefault(field, default)
+    
+    # Run times are parsed without guards afterwards, so reject malformed ones here
+    for field in ('next_run', 'last_run'):
+        if task[field]:
+            try:
+                datetime.fromisoformat(task[field])
+            except (TypeError, ValueError):
+                return f"invalid {field} {task[field]!r}"
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _static_header(title: str, config_name: str, database: str) -> str:
+    """Invariant top lines of a Telegram report for one configuration"""
+    return f"{title}\n🔧 <b>Configuration:</b> {config_name}\n🗄️ <b>Database:</b> {database}\n"
+
+
+def _push_top(heap: list, entry: tuple, size: int = 10):
+    """Keep the `size` largest entries seen so far in a min-heap"""
+    if len(heap) < size:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+
+# Longest single timer wait, so a stepped wall clock is noticed within this many seconds
+_MAX_TIMER_DELAY = 60.0
+
+# Telegram message for a prepared Excel report; only the fields vary per run
+_EXCEL_SUMMARY_TEMPLATE = """📊 <b>Scheduled Report Generated</b>
+🔧 <b>Configuration:</b> {config_name}
+🗄️ <b>Database:</b> {database}
+📋 <b>Report Type:</b> {report_type}
+👥 <b>Groups:</b> {groups} selected
+⏰ <b>Generated:</b> {generated}
+
+📈 <b>Summary:</b>
+{summary}
+
+📎 <b>Excel file attached with detailed data</b>
+
+🔢 <b>Configuration Details:</b>
+• Login Range: {min_login} - {max_login}
+• Record Limit: {limit}
+• Total Sheets: {sheet_count}"""
 
 
 class ScheduledTaskManager:
     def __init__(self):
         self.config_dir = os.path.expanduser("~/.task_creator")
         self.tasks_config_file = os.path.join(self.config_dir, "scheduled_tasks.json")
+        self.tasks_db_file = os.path.join(self.config_dir, "scheduled_tasks.db")
+        self._db = None
         self.telegram_integration = TelegramIntegration()
         self.config_manager = ConfigManager()
         self.tasks = {}
+        self._dirty = set()
+        self._save_lock = threading.Lock()
+        self._save_pending = False
         self.scheduler_thread = None
         self.stop_scheduler = False
+        self._loop = None
+        self._wake_handle = None
+        # Min-heap of (next_run timestamp, task name); an entry is live only while
+        # _queued[name] still holds the same timestamp (stale entries are skipped lazily)
+        self._next_heap = []
+        self._queued = {}
+        # Parsed next_run/last_run per task, kept in step with the ISO strings in each task
+        self._next_run_ts = {}
+        self._next_run_dt = {}
+        self._last_run_dt = {}
+        self._in_flight = set()
+        # Number of active tasks, adjusted wherever a task's active flag changes
+        self._active_count = 0
+        # Bounded pool for blocking report/Telegram work fired by the event loop
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="sched")
+        
+        # Parsed saved configurations, invalidated by saved_configs.json mtime
+        self._config_cache = {}
+        self._all_configs_cache = None
         
         # Detect Python command based on OS
         self.python_cmd = self._get_python_command()
         
         self._ensure_config_dir()
         self._load_tasks()
+        self._install_reload_signal()
+        # Debounced saves run on daemon timers, so write any still pending when the process exits
+        atexit.register(self._save_tasks)
     
     def _get_python_command(self):
         """Get the correct Python command for current OS"""
-        if sys.platform == "win32":
-            # Test different Python commands on Windows
-            test_commands = ["python", "python3", "py"]
-            for cmd in test_commands:
-                try:
-                    result = subprocess.run([cmd, "--version"], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        return cmd
-                except:
-                    continue
-            return "python"  # Default fallback
-        else:
-            return "python3"  # Unix/Linux/macOS
+        return get_python_command()
     
     def _ensure_config_dir(self):
         """Ensure config directory exists"""
         if not os.path.exists(self.config_dir):
             os.makedirs(self.config_dir)
     
+    def _install_reload_signal(self):
+        """Reload saved configurations on SIGHUP where supported"""
+        if not hasattr(signal, 'SIGHUP'):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        try:
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.reload_configs())
+        except (ValueError, OSError):
+            pass
+    
+    def _saved_configs_mtime(self):
+        """Return mtime of the saved configurations file, or None if missing"""
+        try:
+            return os.stat(self.config_manager.config_file).st_mtime
+        except OSError:
+            return None
+    
+    def _get_saved_config(self, config_name: str) -> Optional[Dict]:
+        """Load a saved configuration, reusing the parsed copy while the file is unchanged"""
+        mtime = self._saved_configs_mtime()
+        cached = self._config_cache.get(config_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        config = self.config_manager.load_config(config_name)
+        if config:
+            self._config_cache[config_name] = (mtime, config)
+        else:
+            self._config_cache.pop(config_name, None)
+        return config
+    
+    def _get_all_saved_configs(self) -> Dict:
+        """Load all saved configurations, reusing the parsed copy while the file is unchanged"""
+        mtime = self._saved_configs_mtime()
+        if self._all_configs_cache and self._all_configs_cache[0] == mtime:
+            return self._all_configs_cache[1]
+        
+        saved_configs = self.config_manager.load_all_configs()
+        self._all_configs_cache = (mtime, saved_configs)
+        return saved_configs
+    
+    def reload_configs(self):
+        """Drop cached saved configurations so the next access re-reads them"""
+        self._config_cache.clear()
+        self._all_configs_cache = None
+    
+    def _connect_tasks_db(self):
+        """Open the tasks database and create the table if needed"""
+        db = sqlite3.connect(self.tasks_db_file, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "name TEXT PRIMARY KEY, data TEXT NOT NULL, active INTEGER NOT NULL, next_run TEXT)"
+        )
+        return db
+    
     def _load_tasks(self):
-        """Load scheduled tasks from file"""
+        """Load scheduled tasks from the tasks database"""
         try:
-            if os.path.exists(self.tasks_config_file):
+            self._db = self._connect_tasks_db()
+            rows = self._db.execute("SELECT name, data FROM tasks").fetchall()
+            self.tasks = {name: _loads_task(data) for name, data in rows}
+            
+            # One-time import of the previous JSON tasks file
+            if not self.tasks and os.path.exists(self.tasks_config_file):
                 with open(self.tasks_config_file, 'r') as f:
                     self.tasks = json.load(f)
-                    print(f"✓ Loaded {len(self.tasks)} scheduled tasks")
-            else:
-                self.tasks = {}
+                self._dirty.update(self.tasks)
+                if self._save_tasks():
+                    os.replace(self.tasks_config_file, self.tasks_config_file + '.migrated')
+            
+            # Validate once here so the execution path can index fields directly
+            for task_name, task in list(self.tasks.items()):
+                problem = _normalize_task(task_name, task)
+                if problem:
+                    print(f"⚠️ Skipping scheduled task '{task_name}': {problem}")
+                    del self.tasks[task_name]
+                    continue
+                self._cache_next_run_ts(task_name, task['next_run'])
+                self._cache_last_run_dt(task_name, task['last_run'])
+            self._active_count = sum(1 for task in self.tasks.values() if task['active'])
+            
+            if self.tasks:
+                print(f"✓ Loaded {len(self.tasks)} scheduled tasks")
         except Exception as e:
             print(f"❌ Error loading tasks: {e}")
             self.tasks = {}
+            self._active_count = 0
+    
+    def _cache_next_run_ts(self, task_name: str, next_run: Optional[str]):
+        """Record a task's parsed next_run (datetime and Unix seconds) for comparisons"""
+        if not next_run:
+            self._next_run_dt.pop(task_name, None)
+            self._next_run_ts.pop(task_name, None)
+            return
+        next_dt = datetime.fromisoformat(next_run)
+        self._next_run_dt[task_name] = next_dt
+        self._next_run_ts[task_name] = next_dt.timestamp()
+    
+    def _cache_last_run_dt(self, task_name: str, last_run: Optional[str]):
+        """Record a task's parsed last_run"""
+        if not last_run:
+            self._last_run_dt.pop(task_name, None)
+        else:
+            self._last_run_dt[task_name] = datetime.fromisoformat(last_run)
+    
+    def _set_last_run(self, task_name: str, last_run: datetime):
+        """Update a task's last_run string and its cached datetime together"""
+        self.tasks[task_name]['last_run'] = last_run.isoformat()
+        self._last_run_dt[task_name] = last_run
+    
+    def _set_next_run(self, task_name: str, next_run: str):
+        """Update a task's next_run string and its cached timestamp together"""
+        self.tasks[task_name]['next_run'] = next_run
+        self._cache_next_run_ts(task_name, next_run)
+    
+    def _set_active(self, task_name: str, active: bool):
+        """Update a task's active flag and the active-task count together"""
+        task = self.tasks[task_name]
+        self._active_count += bool(active) - bool(task['active'])
+        task['active'] = active
+    
+    def _mark_dirty(self, task_name: str):
+        """Flag a task as changed so the next save writes its row"""
+        with self._save_lock:
+            self._dirty.add(task_name)
     
     def _save_tasks(self):
-        """Save scheduled tasks to file"""
+        """Write changed (or deleted) tasks to the tasks database"""
         try:
-            with open(self.tasks_config_file, 'w') as f:
-                json.dump(self.tasks, f, indent=2)
+            with self._save_lock:
+                if not self._dirty:
+                    return True
+                
+                names = list(self._dirty)
+                upserts = []
+                deletes = []
+                for name in names:
+                    task = self.tasks.get(name)
+                    if task is None:
+                        deletes.append((name,))
+                    else:
+                        upserts.append((name, _dumps_task(task),
+                                        int(bool(task.get('active'))), task.get('next_run')))
+                
+                # Only the touched rows are rewritten, in one transaction
+                self._db.execute("BEGIN")
+                try:
+                    if upserts:
+                        self._db.executemany(
+                            "INSERT OR REPLACE INTO tasks (name, data, active, next_run) VALUES (?, ?, ?, ?)",
+                            upserts
+                        )
+                    if deletes:
+                        self._db.executemany("DELETE FROM tasks WHERE name = ?", deletes)
+                    self._db.execute("COMMIT")
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+                self._dirty.difference_update(names)
             print("✓ Tasks saved successfully")
             return True
         except Exception as e:
             print(f"❌ Error saving tasks: {e}")
             return False
     
+    def _schedule_save(self):
+        """Coalesce saves from a burst of task executions into one write 0.5s later"""
+        with self._save_lock:
+            if self._save_pending:
+                return
+            self._save_pending = True
+        timer = threading.Timer(0.5, self._flush_save)
+        timer.daemon = True
+        timer.start()
+    
+    def _flush_save(self):
+        """Timer callback: write every task changed since the save was scheduled"""
+        with self._save_lock:
+            self._save_pending = False
+        self._save_tasks()
+    
     def create_task(self):
-        """Create a new scheduled task"""
-        print("\n📅 Create New Scheduled Task")
-        print("=" * 50)
-        
-        # Check if Telegram is configured
-        telegram_status = self.telegram_integration.get_telegram_status()
-        if not telegram_status['configured']:
-            print("❌ Telegram integration not configured!")
-            print("Please setup Telegram integration first.")
-            return False
-        
-        try:
-            # First ask basic questions
-            basic_questions = [
-                inquirer.Text('task_name', message="Enter task name (unique identifier)"),
-                inquirer.Text('description', message="Enter task description"),
-                inquirer.List('report_type', 
-                             message="Select report type",
-                             choices=['Saved Configuration Report'])
-            ]
-            
-            basic_answers = inquirer.prompt(basic_questions)
-            if not basic_answers:
-                print("❌ Task creation cancelled")
-                return False
-            
-            # Initialize answers dict
-            answers = basic_answers.copy()
-            
-            # For saved configuration, database will come from config
-            answers['database'] = 'from_config'
-            
-            # Ask remaining questions
-            remaining_questions = [
-                inquirer.Text('chat_id', message="Enter Telegram chat ID (group or private)"),
-                inquirer.Text('send_time', message="Enter send time (HH:MM format, e.g., 09:30)"),
-                inquirer.List('frequency', 
-                             message="Select frequency",
-                             choices=['Daily', 'Weekly', 'Monthly']),
-                inquirer.Confirm('active', message="Activate this task immediately?", default=True)
-            ]
-            
-            remaining_answers = inquirer.prompt(remaining_questions)
-            if not remaining_answers:
-                print("❌ Task creation cancelled")
-                return False
-            
-            answers.update(remaining_answers)
-            
-            # Get saved configuration
-            saved_configs = self.config_manager.load_all_configs()
-            if not saved_configs:
-                print("❌ No saved configurations found!")
-                print("Please create a configuration first using the main task creator.")
-                return False
-            
-            config_choices = []
-            for name, config in saved_configs.items():
-                groups_info = f"{len(config.get('groups', []))} groups" if config.get('groups') else "All groups"
-                database = config.get('database', 'Unknown')
-                report_type = config.get('report_type', 'Unknown')
-                choice_text = f"{name} - {database} - {groups_info} - {report_type}"
-                config_choices.append((choice_text, name))
-            
-            config_question = [
-                inquirer.List('config_name',
-                             message="Select saved configuration to use",
-                             choices=config_choices)
-            ]
-            
-            config_answer = inquirer.prompt(config_question)
-            if not config_answer:
-                print("❌ Configuration selection cancelled")
-                return False
-            
-            saved_config_name = config_answer['config_name']
-            selected_config = saved_configs[saved_config_name]
-            
-            # Update database from configuration
-            answers['database'] = selected_config.get('database', 'mt5gn_live')
-            
-            print(f"✓ Selected configuration: {saved_config_name}")
-            print(f"   📊 Report Type: {selected_config.get('report_type', 'Unknown')}")
-            print(f"   🗄️ Database: {answers['database']}")
-            print(f"   👥 Groups: {len(selected_config.get('groups', []))} selected" if selected_config.get('groups') else "   👥 Groups: All groups")
-            print(f"   🔢 Login Range: {selected_config.get('min_login', 'N/A')} - {selected_config.get('max_login', 'N/A')}")
-            print(f"   📋 Record Limit: {selected_config.get('limit', 'N/A')}")
-            
-            # Validate task name uniqueness
-            if answers['task_name'] in self.tasks:
-                print(f"❌ Task '{answers['task_name']}' already exists!")
-                return False
-            
-            # Validate time format
-            try:
-                time_parts = answers['send_time'].split(':')
-                if len(time_parts) != 2:
-                    raise ValueError("Invalid time format")
-                hour, minute = int(time_parts[0]), int(time_parts[1])
-                if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                    raise ValueError("Invalid time values")
-            except ValueError:
-                print("❌ Invalid time format! Please use HH:MM format (e.g., 09:30)")
-                return False
-            
-            # Test chat ID
-            print(f"\n🔍 Testing chat ID {answers['chat_id']}...")
-            test_message = f"🤖 Task Creator Test\n\nTesting connection for scheduled task: {answers['task_name']}"
-            
-            if not self.telegram_integration.send_telegram_message(test_message, chat_id=answers['chat_id']):
-                print("❌ Failed to send test message to chat ID")
-                confirm = inquirer.confirm("Continue anyway?", default=False)
-                if not confirm:
-                    return False
-            else:
-                print("✓ Test message sent successfully!")
-            
-            # Create task object
-            task = {
-                'task_name': answers['task_name'],
-                'description': answers['description'],
-                'report_type': answers['report_type'],
-                'database': answers['database'],
-                'chat_id': answers['chat_id'],
-                'send_time': answers['send_time'],
-                'frequency': answers['frequency'],
-                'active': answers['active'],
-                'created_at': datetime.now().isoformat(),
-                'last_run': None,
-                'next_run': self._calculate_next_run(answers['send_time'], answers['frequency']),
-                'run_count': 0,
-                'saved_config_name': saved_config_name  # Store the configuration name
-            }
-            
-            # Save task
-            self.tasks[answers['task_name']] = task
-            if self._save_tasks():
-                print(f"✓ Task '{answers['task_name']}' created successfully!")
-                if answers['active']:
-                    print(f"📅 Next run scheduled for: {task['next_run']}")
-                return True
-            else:
-                print("❌ Failed to save task")
-                return False
-                
-        except KeyboardInterrupt:
-            print("\n❌ Task creation cancelled")
+        """Create a new scheduled task interactively"""
+        from scheduler_cli import create_task
+        return create_task(self)
+    
+    def add_task(self, task: dict) -> bool:
+        """Store a new task, persist it and hand it to a running scheduler"""
+        task_name = task['task_name']
+        problem = _normalize_task(task_name, task)
+        if problem:
+            print(f"❌ Invalid task '{task_name}': {problem}")
             return False
-        except Exception as e:
-            print(f"❌ Error creating task: {e}")
+        previous = self.tasks.get(task_name)
+        self._active_count += bool(task['active']) - bool(previous and previous['active'])
+        self.tasks[task_name] = task
+        self._cache_next_run_ts(task_name, task['next_run'])
+        self._cache_last_run_dt(task_name, task['last_run'])
+        self._mark_dirty(task_name)
+        if not self._save_tasks():
             return False
+        self._rearm_task(task_name)
+        return True
     
-    def _calculate_next_run(self, send_time: str, frequency: str) -> str:
+    def _calculate_next_run(self, send_time: str, frequency: str, now: datetime = None) -> str:
         """Calculate next run time for a task"""
         try:
             hour, minute = map(int, send_time.split(':'))
-            now = datetime.now()
+            now = now or datetime.now()
+            
+            # Today's slot; every frequency is a whole-day offset from it (wall-clock, so DST-safe)
+            today_slot = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            passed = today_slot <= now
             
             if frequency == 'Daily':
-                next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                if next_run <= now:
-                    next_run += timedelta(days=1)
+                next_run = today_slot + timedelta(days=1) if passed else today_slot
             elif frequency == 'Weekly':
-                # Schedule for next Monday at specified time
-                days_ahead = 0 - now.weekday()  # Monday is 0
-                if days_ahead <= 0:  # Target day already happened this week
-                    days_ahead += 7
-                next_run = now + timedelta(days=days_ahead)
-                next_run = next_run.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                # Next Monday at specified time (today if it is Monday and the time is still ahead)
+                days_ahead = -now.weekday() % 7  # Monday is 0
+                if days_ahead == 0 and passed:
+                    days_ahead = 7
+                next_run = today_slot + timedelta(days=days_ahead) if days_ahead else today_slot
             elif frequency == 'Monthly':
-                # Schedule for first day of next month
-                if now.month == 12:
-                    next_run = now.replace(year=now.year + 1, month=1, day=1, hour=hour, minute=minute, second=0, microsecond=0)
+                # First day of the month (today if it is the 1st and the time is still ahead)
+                if now.day == 1 and not passed:
+                    next_run = today_slot
+                elif now.month == 12:
+                    next_run = today_slot.replace(year=now.year + 1, month=1, day=1)
                 else:
-                    next_run = now.replace(month=now.month + 1, day=1, hour=hour, minute=minute, second=0, microsecond=0)
+                    next_run = today_slot.replace(month=now.month + 1, day=1)
             else:
                 next_run = now + timedelta(days=1)
             
@@ -284,12 +432,12 @@ class ScheduledTaskManager:
             print(f"   Chat ID: {task['chat_id']}")
             print(f"   Schedule: {task['frequency']} at {task['send_time']}")
             print(f"   Status: {status}")
-            print(f"   Next Run: {task.get('next_run', 'Not scheduled')}")
-            print(f"   Run Count: {task.get('run_count', 0)}")
-            if task.get('last_run'):
+            print(f"   Next Run: {task['next_run'] or 'Not scheduled'}")
+            print(f"   Run Count: {task['run_count']}")
+            if task['last_run']:
                 print(f"   Last Run: {task['last_run']}")
-            if task.get('success_count', 0) > 0:
-                success_rate = (task.get('success_count', 0) / max(task.get('run_count', 1), 1)) * 100
+            if task['success_count'] > 0:
+                success_rate = (task['success_count'] / max(task['run_count'], 1)) * 100
                 print(f"   Success Rate: {success_rate:.1f}%")
     
     def toggle_task(self, task_name: str = None):
@@ -299,29 +447,25 @@ class ScheduledTaskManager:
             return False
         
         if not task_name:
-            choices = list(self.tasks.keys())
-            questions = [
-                inquirer.List('task_name', 
-                             message="Select task to toggle",
-                             choices=choices)
-            ]
-            answers = inquirer.prompt(questions)
-            if not answers:
+            from scheduler_cli import select_task
+            task_name = select_task(self, "Select task to toggle")
+            if not task_name:
                 return False
-            task_name = answers['task_name']
         
         if task_name not in self.tasks:
             print(f"❌ Task '{task_name}' not found!")
             return False
         
         task = self.tasks[task_name]
-        task['active'] = not task['active']
+        self._set_active(task_name, not task['active'])
         
         if task['active']:
             # Recalculate next run when activating
-            task['next_run'] = self._calculate_next_run(task['send_time'], task['frequency'])
+            self._set_next_run(task_name, self._calculate_next_run(task['send_time'], task['frequency']))
         
+        self._mark_dirty(task_name)
         if self._save_tasks():
+            self._rearm_task(task_name)
             status = "activated" if task['active'] else "deactivated"
             print(f"✓ Task '{task_name}' {status} successfully!")
             return True
@@ -336,25 +480,24 @@ class ScheduledTaskManager:
             return False
         
         if not task_name:
-            choices = list(self.tasks.keys())
-            questions = [
-                inquirer.List('task_name', 
-                             message="Select task to delete",
-                             choices=choices),
-                inquirer.Confirm('confirm', message="Are you sure you want to delete this task?", default=False)
-            ]
-            answers = inquirer.prompt(questions)
-            if not answers or not answers['confirm']:
+            from scheduler_cli import select_task_to_delete
+            task_name = select_task_to_delete(self)
+            if not task_name:
                 return False
-            task_name = answers['task_name']
         
         if task_name not in self.tasks:
             print(f"❌ Task '{task_name}' not found!")
             return False
         
-        del self.tasks[task_name]
+        if self.tasks.pop(task_name)['active']:
+            self._active_count -= 1
+        self._next_run_ts.pop(task_name, None)
+        self._next_run_dt.pop(task_name, None)
+        self._last_run_dt.pop(task_name, None)
         
+        self._mark_dirty(task_name)
         if self._save_tasks():
+            self._rearm_task(task_name)
             print(f"✓ Task '{task_name}' deleted successfully!")
             return True
         else:
@@ -378,25 +521,13 @@ class ScheduledTaskManager:
                 report_result = self._generate_config_based_report(task)
                 
                 if isinstance(report_result, dict):
-                    # We have Excel file to send
-                    message = report_result['message']
-                    excel_file = report_result['excel_file']
-                    
-                    # Send message with Excel file to Telegram
+                    # Send message with the in-memory Excel workbook to Telegram
                     success = self.telegram_integration.send_telegram_message(
-                        message=message,
-                        file_path=excel_file,
-                        chat_id=task['chat_id']
+                        message=report_result['message'],
+                        chat_id=task['chat_id'],
+                        file_obj=report_result['buffer'],
+                        filename=report_result['filename']
                     )
-                    
-                    # Clean up Excel file after sending
-                    try:
-                        import os
-                        if os.path.exists(excel_file):
-                            os.remove(excel_file)
-                            print(f"✓ Cleaned up Excel file: {excel_file}")
-                    except Exception as e:
-                        print(f"⚠️ Could not remove Excel file: {e}")
                         
                 else:
                     # Error message, send as text
@@ -412,26 +543,33 @@ class ScheduledTaskManager:
                     chat_id=task['chat_id']
                 )
             
+            # One timestamp for all bookkeeping below, taken once the report has been sent
+            now = datetime.now()
+            
             if success:
                 # Update task execution info
-                task['last_run'] = datetime.now().isoformat()
-                task['run_count'] = task.get('run_count', 0) + 1
-                task['success_count'] = task.get('success_count', 0) + 1
-                task['next_run'] = self._calculate_next_run(task['send_time'], task['frequency'])
+                self._set_last_run(task_name, now)
+                task['run_count'] += 1
+                task['success_count'] += 1
+                self._set_next_run(task_name, self._calculate_next_run(task['send_time'], task['frequency'], now))
                 task['last_error'] = None  # Clear any previous errors
-                self._save_tasks()
+                self._mark_dirty(task_name)
+                self._schedule_save()
+                self._rearm_task(task_name)
                 
                 print(f"✓ Task '{task_name}' executed successfully!")
                 print(f"📅 Next run scheduled for: {task['next_run']}")
                 return True
             else:
                 # Update error tracking
-                task['last_run'] = datetime.now().isoformat()
-                task['run_count'] = task.get('run_count', 0) + 1
-                task['error_count'] = task.get('error_count', 0) + 1
-                task['last_error'] = f"Failed to send report at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                task['next_run'] = self._calculate_next_run(task['send_time'], task['frequency'])
-                self._save_tasks()
+                self._set_last_run(task_name, now)
+                task['run_count'] += 1
+                task['error_count'] += 1
+                task['last_error'] = f"Failed to send report at {now.strftime('%Y-%m-%d %H:%M:%S')}"
+                self._set_next_run(task_name, self._calculate_next_run(task['send_time'], task['frequency'], now))
+                self._mark_dirty(task_name)
+                self._schedule_save()
+                self._rearm_task(task_name)
                 
                 print(f"❌ Failed to send report for task '{task_name}'")
                 return False
@@ -448,7 +586,7 @@ class ScheduledTaskManager:
                 return "❌ No saved configuration specified for this task"
             
             # Load the saved configuration
-            config = self.config_manager.load_config(saved_config_name)
+            config = self._get_saved_config(saved_config_name)
             if not config:
                 return f"❌ Saved configuration '{saved_config_name}' not found"
             
@@ -461,28 +599,28 @@ class ScheduledTaskManager:
     def _execute_config_based_report(self, config: dict, config_name: str) -> str:
         """Execute report generation based on configuration parameters"""
         try:
-            from excel_exporter import ExcelExporter
-            import os
-            
             print(f"📊 Generating report for configuration: {config_name}")
             print(f"🗄️ Database: {config.get('database', 'Unknown')}")
             print(f"👥 Groups: {len(config.get('groups', []))} selected" if config.get('groups') else "👥 Groups: All groups")
             
-            # Create Excel file using the new function
+            # Fresh exporter per run, so runs overlapping on the pool never share one
             excel_exporter = ExcelExporter()
             
-            # Export to Excel using saved configuration
-            excel_path = excel_exporter.export_config_report_to_xlsx(config)
+            # Export to an in-memory workbook using saved configuration, written through a
+            # write-only workbook (rows are buffered per sheet, then written as styled cells)
+            buffer = io.BytesIO()
+            filename = excel_exporter.export_config_report_to_xlsx(config, streaming=True, sink=buffer)
             
-            if excel_path and os.path.exists(excel_path):
-                print(f"✓ Excel file created: {excel_path}")
+            if filename:
+                print(f"✓ Excel workbook built in memory: {filename}")
                 
                 # Format summary message for Telegram
-                summary_message = self._format_config_summary_for_telegram(config, config_name, excel_path)
+                summary_message = self._format_config_summary_for_telegram(config, config_name, buffer.tell())
                 
                 return {
                     'message': summary_message,
-                    'excel_file': excel_path,
+                    'buffer': buffer,
+                    'filename': filename,
                     'config_name': config_name,
                     'report_type': config.get('report_type', 'Configuration Report')
                 }
@@ -492,20 +630,15 @@ class ScheduledTaskManager:
         except Exception as e:
             return f"❌ Error executing config-based report: {str(e)}"
     
-    def _format_config_summary_for_telegram(self, config: dict, config_name: str, excel_path: str) -> str:
+    def _format_config_summary_for_telegram(self, config: dict, config_name: str, file_size: int) -> str:
         """Format configuration summary for Telegram"""
         try:
-            import os
-            
-            # Get file size
-            file_size = os.path.getsize(excel_path) if os.path.exists(excel_path) else 0
             file_size_mb = file_size / (1024 * 1024)
             
             # Format report
-            report = f"""📊 <b>Configuration Report</b>
-🔧 <b>Configuration:</b> {config_name}
-🗄️ <b>Database:</b> {config.get('database', 'Unknown').upper()}
-⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            header = _static_header("📊 <b>Configuration Report</b>", config_name,
+                                    config.get('database', 'Unknown').upper())
+            report = header + f"""⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 📋 <b>Configuration Details:</b>"""
             
@@ -560,17 +693,25 @@ class ScheduledTaskManager:
         
         # Calculate summary statistics
         total_logins = len(results)
-        total_balance = sum(float(r.get('balance', 0)) for r in results)
-        total_deposits = sum(float(r.get('monthly_deposits', 0)) for r in results)
-        total_withdrawals = sum(float(r.get('monthly_withdrawals', 0)) for r in results)
-        total_promotions = sum(float(r.get('monthly_promotions', 0)) for r in results)
+        total_balance = total_deposits = total_withdrawals = total_promotions = 0.0
+        heap = []
+        for i, r in enumerate(results):
+            balance = float(r.get('balance', 0))
+            d = float(r.get('monthly_deposits', 0))
+            w = float(r.get('monthly_withdrawals', 0))
+            p = float(r.get('monthly_promotions', 0))
+            total_balance += balance
+            total_deposits += d
+            total_withdrawals += w
+            total_promotions += p
+            # -i keeps the earlier record first among equal balances
+            _push_top(heap, (balance, -i, d - w + p))
         net_flow = total_deposits - total_withdrawals + total_promotions
         
         # Format report
-        report = f"""📊 <b>Monthly Summary Report</b>
-🔧 <b>Configuration:</b> {config_name}
-🗄️ <b>Database:</b> {config.get('database', 'Unknown').upper()}
-⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        header = _static_header("📊 <b>Monthly Summary Report</b>", config_name,
+                                config.get('database', 'Unknown').upper())
+        report = header + f"""⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 📈 <b>Summary Statistics:</b>
 👥 Total Logins: {total_logins:,}
@@ -583,11 +724,8 @@ class ScheduledTaskManager:
 🔝 <b>Top {min(10, len(results))} Accounts:</b>"""
         
         # Sort by balance and show top accounts
-        sorted_results = sorted(results, key=lambda x: float(x.get('balance', 0)), reverse=True)
-        for i, record in enumerate(sorted_results[:10], 1):
-            login = record.get('login', 'N/A')
-            balance = float(record.get('balance', 0))
-            monthly_total = float(record.get('monthly_deposits', 0)) - float(record.get('monthly_withdrawals', 0)) + float(record.get('monthly_promotions', 0))
+        for i, (balance, neg_idx, monthly_total) in enumerate(sorted(heap, reverse=True), 1):
+            login = results[-neg_idx].get('login', 'N/A')
             report += f"\n{i}. Login {login}: ${balance:,.2f} (Monthly: ${monthly_total:+,.2f})"
         
         if len(results) > 10:
@@ -601,13 +739,17 @@ class ScheduledTaskManager:
             return f"❌ No data found for configuration: {config_name}"
         
         total_logins = len(results)
-        total_balance = sum(float(r.get('balance', 0)) for r in results)
+        total_balance = 0.0
+        heap = []
+        for i, r in enumerate(results):
+            balance = float(r.get('balance', 0))
+            total_balance += balance
+            _push_top(heap, (balance, -i))
         avg_balance = total_balance / total_logins if total_logins > 0 else 0
         
-        report = f"""💰 <b>Balance Report</b>
-🔧 <b>Configuration:</b> {config_name}
-🗄️ <b>Database:</b> {config.get('database', 'Unknown').upper()}
-⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        header = _static_header("💰 <b>Balance Report</b>", config_name,
+                                config.get('database', 'Unknown').upper())
+        report = header + f"""⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 📊 <b>Balance Summary:</b>
 👥 Total Logins: {total_logins:,}
@@ -616,10 +758,8 @@ class ScheduledTaskManager:
 
 🔝 <b>Top {min(10, len(results))} Balances:</b>"""
         
-        sorted_results = sorted(results, key=lambda x: float(x.get('balance', 0)), reverse=True)
-        for i, record in enumerate(sorted_results[:10], 1):
-            login = record.get('login', 'N/A')
-            balance = float(record.get('balance', 0))
+        for i, (balance, neg_idx) in enumerate(sorted(heap, reverse=True), 1):
+            login = results[-neg_idx].get('login', 'N/A')
             report += f"\n{i}. Login {login}: ${balance:,.2f}"
         
         if len(results) > 10:
@@ -632,18 +772,25 @@ class ScheduledTaskManager:
         if not results:
             return f"❌ No data found for configuration: {config_name}"
         
-        total_deposits = sum(float(r.get('monthly_deposits', 0)) for r in results)
-        total_withdrawals = sum(float(r.get('monthly_withdrawals', 0)) for r in results)
-        total_promotions = sum(float(r.get('monthly_promotions', 0)) for r in results)
-        deposit_count = sum(int(r.get('deposit_count', 0)) for r in results)
-        withdrawal_count = sum(int(r.get('withdrawal_count', 0)) for r in results)
-        promotion_count = sum(int(r.get('promotion_count', 0)) for r in results)
+        total_deposits = total_withdrawals = total_promotions = 0.0
+        deposit_count = withdrawal_count = promotion_count = 0
+        heap = []
+        for i, r in enumerate(results):
+            d = float(r.get('monthly_deposits', 0))
+            w = float(r.get('monthly_withdrawals', 0))
+            p = float(r.get('monthly_promotions', 0))
+            total_deposits += d
+            total_withdrawals += w
+            total_promotions += p
+            deposit_count += int(r.get('deposit_count', 0))
+            withdrawal_count += int(r.get('withdrawal_count', 0))
+            promotion_count += int(r.get('promotion_count', 0))
+            _push_top(heap, (d + w + p, -i, d - w + p))
         net_flow = total_deposits - total_withdrawals + total_promotions
         
-        report = f"""💸 <b>Financial Report</b>
-🔧 <b>Configuration:</b> {config_name}
-🗄️ <b>Database:</b> {config.get('database', 'Unknown').upper()}
-⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        header = _static_header("💸 <b>Financial Report</b>", config_name,
+                                config.get('database', 'Unknown').upper())
+        report = header + f"""⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 📊 <b>Financial Summary:</b>
 💰 Monthly Deposits: ${total_deposits:,.2f} ({deposit_count:,} txns)
@@ -654,14 +801,8 @@ class ScheduledTaskManager:
 🔝 <b>Top {min(10, len(results))} Financial Activity:</b>"""
         
         # Sort by total financial activity
-        sorted_results = sorted(results, key=lambda x: float(x.get('monthly_deposits', 0)) + float(x.get('monthly_withdrawals', 0)) + float(x.get('monthly_promotions', 0)), reverse=True)
-        for i, record in enumerate(sorted_results[:10], 1):
-            login = record.get('login', 'N/A')
-            deposits = float(record.get('monthly_deposits', 0))
-            withdrawals = float(record.get('monthly_withdrawals', 0))
-            promotions = float(record.get('monthly_promotions', 0))
-            total_activity = deposits + withdrawals + promotions
-            net_amount = deposits - withdrawals + promotions
+        for i, (total_activity, neg_idx, net_amount) in enumerate(sorted(heap, reverse=True), 1):
+            login = results[-neg_idx].get('login', 'N/A')
             report += f"\n{i}. Login {login}: ${total_activity:,.2f} activity (Net: ${net_amount:+,.2f})"
         
         if len(results) > 10:
@@ -674,14 +815,20 @@ class ScheduledTaskManager:
         if not results:
             return f"❌ No data found for configuration: {config_name}"
         
-        total_transactions = sum(int(r.get('total_transactions', 0)) for r in results)
-        total_volume = sum(float(r.get('total_volume', 0)) for r in results)
+        total_transactions = 0
+        total_volume = 0.0
+        heap = []
+        for i, r in enumerate(results):
+            txn_count = int(r.get('total_transactions', 0))
+            volume = float(r.get('total_volume', 0))
+            total_transactions += txn_count
+            total_volume += volume
+            _push_top(heap, (txn_count, -i, volume))
         avg_volume = total_volume / total_transactions if total_transactions > 0 else 0
         
-        report = f"""📊 <b>Transaction Report</b>
-🔧 <b>Configuration:</b> {config_name}
-🗄️ <b>Database:</b> {config.get('database', 'Unknown').upper()}
-⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        header = _static_header("📊 <b>Transaction Report</b>", config_name,
+                                config.get('database', 'Unknown').upper())
+        report = header + f"""⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 📈 <b>Transaction Summary:</b>
 📊 Total Transactions: {total_transactions:,}
@@ -690,13 +837,10 @@ class ScheduledTaskManager:
 
 🔝 <b>Top {min(10, len(results))} Transaction Activity:</b>"""
         
-        sorted_results = sorted(results, key=lambda x: int(x.get('total_transactions', 0)), reverse=True)
-        for i, record in enumerate(sorted_results[:10], 1):
-            login = record.get('login', 'N/A')
-            transactions = int(record.get('total_transactions', 0))
-            volume = float(record.get('total_volume', 0))
-            avg_txn = volume / transactions if transactions > 0 else 0
-            report += f"\n{i}. Login {login}: {transactions:,} txns (${volume:,.2f}, avg: ${avg_txn:,.2f})"
+        for i, (txn_count, neg_idx, volume) in enumerate(sorted(heap, reverse=True), 1):
+            login = results[-neg_idx].get('login', 'N/A')
+            avg_txn = volume / txn_count if txn_count > 0 else 0
+            report += f"\n{i}. Login {login}: {txn_count:,} txns (${volume:,.2f}, avg: ${avg_txn:,.2f})"
         
         if len(results) > 10:
             report += f"\n... and {len(results) - 10} more accounts"
@@ -704,12 +848,13 @@ class ScheduledTaskManager:
         return report
     
     def start_scheduler(self):
-        """Start the task scheduler in a background thread"""
+        """Start the task scheduler event loop in a background thread"""
         if self.scheduler_thread and self.scheduler_thread.is_alive():
             print("⚠️ Scheduler is already running!")
             return False
         
         self.stop_scheduler = False
+        self._loop = asyncio.new_event_loop()
         self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
         self.scheduler_thread.start()
         
@@ -724,72 +869,178 @@ class ScheduledTaskManager:
             return False
         
         self.stop_scheduler = True
+        self._loop.call_soon_threadsafe(self._loop.stop)
         print("🛑 Stopping scheduler...")
         return True
     
+    def close(self):
+        """Stop the scheduler and release the worker pool"""
+        if self.scheduler_thread and self.scheduler_thread.is_alive():
+            self.stop_scheduler_service()
+            self.scheduler_thread.join(timeout=5)
+        self._executor.shutdown(wait=True)
+        # Flush anything still waiting on a debounced save
+        self._save_tasks()
+    
     def _run_scheduler(self):
-        """Main scheduler loop"""
+        """Run the scheduler event loop, waking only when the soonest task is due"""
         print("🔄 Scheduler thread started")
+        loop = self._loop
+        asyncio.set_event_loop(loop)
         
-        while not self.stop_scheduler:
-            try:
-                now = datetime.now()
-                
-                # Check each active task
-                for task_name, task in self.tasks.items():
-                    if not task['active']:
-                        continue
-                    
-                    next_run_str = task.get('next_run')
-                    if not next_run_str:
-                        continue
-                    
-                    try:
-                        next_run = datetime.fromisoformat(next_run_str)
-                        
-                        # Check if it's time to run the task (within 1 minute window)
-                        if now >= next_run and (now - next_run).total_seconds() < 60:
-                            print(f"⏰ Executing scheduled task: {task_name}")
-                            print(f"   📊 Report Type: {task['report_type']}")
-                            print(f"   🗄️ Database: {task['database']}")
-                            print(f"   💬 Chat ID: {task['chat_id']}")
-                            print(f"   📅 Scheduled for: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
-                            print(f"   ⏱️ Actual execution: {now.strftime('%Y-%m-%d %H:%M:%S')}")
-                            
-                            execution_success = self.execute_task(task_name)
-                            
-                            if execution_success:
-                                print(f"✅ Successfully executed scheduled task: {task_name}")
-                            else:
-                                print(f"❌ Failed to execute scheduled task: {task_name}")
-                                # Add error logging
-                                error_msg = f"Scheduled execution failed at {now.strftime('%Y-%m-%d %H:%M:%S')}"
-                                task['last_error'] = error_msg
-                                self._save_tasks()
-                    
-                    except ValueError as e:
-                        print(f"❌ Invalid next_run format for task {task_name}: {e}")
-                
-                # Sleep for 30 seconds before checking again
-                time.sleep(30)
-                
-            except Exception as e:
-                print(f"❌ Scheduler error: {e}")
-                time.sleep(60)  # Wait longer on error
+        self._next_heap.clear()
+        self._queued.clear()
+        for task_name in list(self.tasks):
+            self._index_task(task_name)
+        self._arm_next()
         
-        print("🛑 Scheduler thread stopped")
+        try:
+            loop.run_forever()
+            # Let runs still awaiting the pool unwind (their finally re-indexes) before closing
+            pending = asyncio.all_tasks(loop)
+            for run in pending:
+                run.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        finally:
+            if self._wake_handle:
+                self._wake_handle.cancel()
+                self._wake_handle = None
+            loop.close()
+            print("🛑 Scheduler thread stopped")
+    
+    def _rearm_task(self, task_name: str):
+        """Re-index a task from any thread after its schedule changed"""
+        loop = self._loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(self._reindex_and_arm, task_name)
+    
+    def _reindex_and_arm(self, task_name: str):
+        """Loop-thread half of _rearm_task"""
+        self._index_task(task_name)
+        self._arm_next()
+    
+    def _index_task(self, task_name: str):
+        """Push a task's next_run onto the heap (loop thread only)"""
+        task = self.tasks.get(task_name)
+        next_ts = self._next_run_ts.get(task_name)
+        if not task or not task['active'] or next_ts is None:
+            self._queued.pop(task_name, None)
+            return
+        
+        if self._queued.get(task_name) != next_ts:
+            self._queued[task_name] = next_ts
+            heapq.heappush(self._next_heap, (next_ts, task_name))
+    
+    def _arm_next(self):
+        """Set the single loop timer for the soonest live heap entry.
+        
+        The loop sleeps until the head is due, and schedule changes from other threads
+        wake it through _rearm_task. The timer runs on the loop's monotonic clock while
+        next_run is wall-clock time, so waits are capped at _MAX_TIMER_DELAY; an NTP step
+        or resume from suspend is then re-checked promptly instead of firing late.
+        """
+        if self._wake_handle:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+        
+        heap = self._next_heap
+        while heap and self._queued.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        if heap:
+            delay = min(heap[0][0] - time.time(), _MAX_TIMER_DELAY)
+            self._wake_handle = self._loop.call_later(max(delay, 0), self._on_wake)
+    
+    def _on_wake(self):
+        """Timer callback: start every due task without blocking the event loop"""
+        self._wake_handle = None
+        now_ts = time.time()
+        heap = self._next_heap
+        rolled_forward = False
+        
+        while heap and heap[0][0] <= now_ts:
+            next_ts, task_name = heapq.heappop(heap)
+            if self._queued.get(task_name) != next_ts:
+                continue
+            del self._queued[task_name]
+            
+            if now_ts - next_ts > 60:
+                # Missed by more than the 1 minute window (e.g. the scheduler was stopped): the
+                # slot is skipped, not run late, and next_run moves on to the following slot
+                task = self.tasks[task_name]
+                self._set_next_run(task_name, self._calculate_next_run(task['send_time'], task['frequency']))
+                self._mark_dirty(task_name)
+                self._index_task(task_name)
+                rolled_forward = True
+            elif task_name not in self._in_flight:
+                self._in_flight.add(task_name)
+                self._loop.create_task(self._run_scheduled_task(task_name))
+        
+        # One save for every slot rolled forward in this tick
+        if rolled_forward:
+            self._schedule_save()
+        self._arm_next()
+    
+    async def _run_scheduled_task(self, task_name: str):
+        """Execute a due task on the worker pool, then re-arm its timer"""
+        task = self.tasks.get(task_name)
+        if not task or not task['active']:
+            self._in_flight.discard(task_name)
+            return
+        
+        fired_for = self._next_run_ts.get(task_name)
+        try:
+            now = datetime.now()
+            
+            # next_run may have moved (manual execution, toggle) since the timer was armed
+            if fired_for is None or now.timestamp() < fired_for:
+                fired_for = None
+                return
+            next_run = self._next_run_dt[task_name]
+            
+            print(f"⏰ Executing scheduled task: {task_name}")
+            print(f"   📊 Report Type: {task['report_type']}")
+            print(f"   🗄️ Database: {task['database']}")
+            print(f"   💬 Chat ID: {task['chat_id']}")
+            print(f"   📅 Scheduled for: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"   ⏱️ Actual execution: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+            
+            # Report generation and the Telegram upload are blocking calls; dispatch them
+            # straight to the pool (asyncio.to_thread would add a contextvars copy per run)
+            execution_success = await self._loop.run_in_executor(self._executor, self.execute_task, task_name)
+            
+            if execution_success:
+                print(f"✅ Successfully executed scheduled task: {task_name}")
+            else:
+                print(f"❌ Failed to execute scheduled task: {task_name}")
+                # Add error logging
+                error_msg = f"Scheduled execution failed at {now.strftime('%Y-%m-%d %H:%M:%S')}"
+                task['last_error'] = error_msg
+                self._mark_dirty(task_name)
+                self._schedule_save()
+        
+        except Exception as e:
+            print(f"❌ Scheduler error: {e}")
+        finally:
+            # Never re-fire the same slot if execution bailed out before advancing next_run
+            if fired_for and task_name in self.tasks and self._next_run_ts.get(task_name) == fired_for:
+                self._set_next_run(task_name, self._calculate_next_run(task['send_time'], task['frequency']))
+                self._mark_dirty(task_name)
+                self._schedule_save()
+            self._in_flight.discard(task_name)
+            self._index_task(task_name)
+            self._arm_next()
     
     def get_scheduler_status(self):
         """Get current scheduler status"""
         running = (self.scheduler_thread and 
                   self.scheduler_thread.is_alive() and 
                   not self.stop_scheduler)
-        active_tasks = sum(1 for task in self.tasks.values() if task['active'])
         
         return {
             'running': running,
             'total_tasks': len(self.tasks),
-            'active_tasks': active_tasks,
+            'active_tasks': self._active_count,
             'thread_alive': self.scheduler_thread.is_alive() if self.scheduler_thread else False
         }
     
@@ -810,43 +1061,26 @@ class ScheduledTaskManager:
             }
         
         total_tasks = len(self.tasks)
-        active_tasks = sum(1 for task in self.tasks.values() if task['active'])
-        inactive_tasks = total_tasks - active_tasks
+        active_tasks = self._active_count
+        total_executions = successful_executions = failed_executions = tasks_with_errors = 0
+        next_execution = None
+        next_run_dt = self._next_run_dt
         
-        total_executions = sum(task.get('run_count', 0) for task in self.tasks.values())
-        successful_executions = sum(task.get('success_count', 0) for task in self.tasks.values())
-        failed_executions = sum(task.get('error_count', 0) for task in self.tasks.values())
+        # One pass over the tasks for every counter and the next-execution minimum
+        for task_name, task in self.tasks.items():
+            total_executions += task['run_count']
+            successful_executions += task['success_count']
+            failed_executions += task['error_count']
+            if task['last_error']:
+                tasks_with_errors += 1
+            if task['active']:
+                next_run = next_run_dt.get(task_name)
+                if next_run and (next_execution is None or next_run < next_execution):
+                    next_execution = next_run
         
+        inactive_tasks = total_tasks - active_tasks
         success_rate = (successful_executions / total_executions * 100) if total_executions > 0 else 0
-        tasks_with_errors = sum(1 for task in self.tasks.values() if task.get('last_error'))
-        
-        # Find next execution
-        next_execution = None
-        next_executions = []
-        for task in self.tasks.values():
-            if task['active'] and task.get('next_run'):
-                try:
-                    next_run_time = datetime.fromisoformat(task['next_run'])
-                    next_executions.append(next_run_time)
-                except:
-                    pass
-        
-        if next_executions:
-            next_execution = min(next_executions)
-        
-        # Find last execution
-        last_execution = None
-        last_executions = []
-        for task in self.tasks.values():
-            if task.get('last_run'):
-                try:
-                    last_run_time = datetime.fromisoformat(task['last_run'])
-                    last_executions.append(last_run_time)
-                except:
-                    pass
-        
-        if last_executions:
-            last_execution = max(last_executions)
+        last_execution = max(self._last_run_dt.values(), default=None)
         
         return {
             'total_tasks': total_tasks,
@@ -865,6 +1099,7 @@ class ScheduledTaskManager:
         """Generate a health report for all tasks"""
         health_report = []
         now = datetime.now()
+        running = self.get_scheduler_status()['running']
         
         for task_name, task in self.tasks.items():
             health_status = "🟢 Healthy"
@@ -889,17 +1124,14 @@ class ScheduledTaskManager:
                     health_status = "🟡 Warning" if health_status == "🟢 Healthy" else health_status
                     issues.append(f"Low success rate: {success_rate:.1f}%")
             
-            # Check if next run is overdue (for active tasks)
-            if task['active'] and task.get('next_run'):
-                try:
-                    next_run = datetime.fromisoformat(task['next_run'])
-                    if next_run < now:
-                        time_overdue = now - next_run
-                        if time_overdue.total_seconds() > 300:  # 5 minutes
-                            health_status = "🔴 Unhealthy"
-                            issues.append(f"Overdue by {time_overdue}")
-                except:
-                    pass
+            # A running scheduler skips a slot missed by over a minute and moves next_run on, so
+            # a stale next_run means the slot passed while the scheduler was stopped
+            next_run = self._next_run_dt.get(task_name)
+            if task['active'] and not running and next_run and next_run < now:
+                time_missed = now - next_run
+                if time_missed.total_seconds() > 300:  # 5 minutes
+                    health_status = "🔴 Unhealthy"
+                    issues.append(f"Missed by {time_missed} while the scheduler was stopped (slot will be skipped)")
             
             health_report.append({
                 'task_name': task_name,
@@ -913,35 +1145,41 @@ class ScheduledTaskManager:
         
         return health_report
 
-    def _prepare_daily_report_excel_data(self, results: list, config: dict, config_name: str) -> dict:
+    def _prepare_daily_report_excel_data(self, results: list, config: dict, config_name: str,
+                                         summary_only: bool = False) -> dict:
         """Prepare daily report data for Excel export"""
         if not results:
-            return {'sheets': {}, 'summary': 'No data available'}
+            return {'sheets': {}, 'sheet_count': 0, 'summary': 'No data available'}
         
-        # Calculate summary statistics
+        # Prepare main data sheet, accumulating summary statistics in the same pass
         total_logins = len(results)
-        total_balance = sum(float(r.get('balance', 0)) for r in results)
-        total_deposits = sum(float(r.get('monthly_deposits', 0)) for r in results)
-        total_withdrawals = sum(float(r.get('monthly_withdrawals', 0)) for r in results)
-        total_promotions = sum(float(r.get('monthly_promotions', 0)) for r in results)
-        net_flow = total_deposits - total_withdrawals + total_promotions
-        
-        # Prepare main data sheet
+        total_balance = total_deposits = total_withdrawals = total_promotions = 0.0
         main_data = []
         for record in results:
+            balance = float(record.get('balance') or 0)
+            d = float(record.get('monthly_deposits') or 0)
+            w = float(record.get('monthly_withdrawals') or 0)
+            p = float(record.get('monthly_promotions') or 0)
+            total_balance += balance
+            total_deposits += d
+            total_withdrawals += w
+            total_promotions += p
+            if summary_only:
+                continue
             main_data.append({
                 'Login': record.get('login', 'N/A'),
-                'Balance': float(record.get('balance', 0)),
-                'Monthly Deposits': float(record.get('monthly_deposits', 0)),
-                'Monthly Withdrawals': float(record.get('monthly_withdrawals', 0)),
-                'Monthly Promotions': float(record.get('monthly_promotions', 0)),
-                'Net Monthly Flow': float(record.get('monthly_deposits', 0)) - float(record.get('monthly_withdrawals', 0)) + float(record.get('monthly_promotions', 0)),
-                'Deposit Count': int(record.get('deposit_count', 0)),
-                'Withdrawal Count': int(record.get('withdrawal_count', 0)),
-                'Promotion Count': int(record.get('promotion_count', 0)),
+                'Balance': balance,
+                'Monthly Deposits': d,
+                'Monthly Withdrawals': w,
+                'Monthly Promotions': p,
+                'Net Monthly Flow': d - w + p,
+                'Deposit Count': int(record.get('deposit_count') or 0),
+                'Withdrawal Count': int(record.get('withdrawal_count') or 0),
+                'Promotion Count': int(record.get('promotion_count') or 0),
                 'Last Activity': record.get('last_activity', 'N/A'),
                 'Registration Date': record.get('registration_date', 'N/A')
             })
+        net_flow = total_deposits - total_withdrawals + total_promotions
         
         # Prepare summary sheet
         summary_data = [
@@ -955,10 +1193,11 @@ class ScheduledTaskManager:
         ]
         
         return {
-            'sheets': {
+            'sheets': {} if summary_only else {
                 'Daily Report Data': main_data,
                 'Summary': summary_data
             },
+            'sheet_count': 2,
             'summary': f"Daily Report: {total_logins} accounts, ${total_balance:,.2f} total balance, ${net_flow:,.2f} net flow",
             'config_info': {
                 'name': config_name,
@@ -968,53 +1207,58 @@ class ScheduledTaskManager:
             }
         }
     
-    def _prepare_deals_excel_data(self, results: list, config: dict, config_name: str) -> dict:
+    def _prepare_deals_excel_data(self, results: list, config: dict, config_name: str,
+                                  summary_only: bool = False) -> dict:
         """Prepare deals categorizer data for Excel export"""
         if not results:
-            return {'sheets': {}, 'summary': 'No data available'}
-        
-        # Categorize deals
-        deposits = [r for r in results if r.get('deal_type') == 'Deposit']
-        withdrawals = [r for r in results if r.get('deal_type') == 'Withdrawal']
-        promotions = [r for r in results if r.get('deal_type') == 'Promotion']
-        
-        # Calculate totals
-        total_deposit_amount = sum(float(d.get('amount', 0)) for d in deposits)
-        total_withdrawal_amount = sum(float(w.get('amount', 0)) for w in withdrawals)
-        total_promotion_amount = sum(float(p.get('amount', 0)) for p in promotions)
-        
-        # Prepare deposits sheet
+            return {'sheets': {}, 'sheet_count': 0, 'summary': 'No data available'}
+        
+        # Categorize deals and total their amounts in one pass
+        buckets = {'Deposit': [], 'Withdrawal': [], 'Promotion': []}
+        totals = dict.fromkeys(buckets, 0.0)
+        for r in results:
+            deal_type = r.get('deal_type')
+            bucket = buckets.get(deal_type)
+            if bucket is not None:
+                bucket.append(r)
+                totals[deal_type] += float(r.get('amount') or 0)
+        deposits, withdrawals, promotions = buckets.values()
+        total_deposit_amount, total_withdrawal_amount, total_promotion_amount = totals.values()
+        
+        # Prepare the per-category sheets unless only the summary is wanted
         deposits_data = []
-        for deal in deposits:
-            deposits_data.append({
-                'Login': deal.get('login', 'N/A'),
-                'Amount': float(deal.get('amount', 0)),
-                'Date': deal.get('deal_time', 'N/A'),
-                'Comment': deal.get('comment', 'N/A'),
-                'Ticket': deal.get('ticket', 'N/A')
-            })
-        
-        # Prepare withdrawals sheet
         withdrawals_data = []
-        for deal in withdrawals:
-            withdrawals_data.append({
-                'Login': deal.get('login', 'N/A'),
-                'Amount': abs(float(deal.get('amount', 0))),
-                'Date': deal.get('deal_time', 'N/A'),
-                'Comment': deal.get('comment', 'N/A'),
-                'Ticket': deal.get('ticket', 'N/A')
-            })
-        
-        # Prepare promotions sheet
         promotions_data = []
-        for deal in promotions:
-            promotions_data.append({
-                'Login': deal.get('login', 'N/A'),
-                'Amount': float(deal.get('amount', 0)),
-                'Date': deal.get('deal_time', 'N/A'),
-                'Comment': deal.get('comment', 'N/A'),
-                'Ticket': deal.get('ticket', 'N/A')
-            })
+        if not summary_only:
+            # Prepare deposits sheet
+            for deal in deposits:
+                deposits_data.append({
+                    'Login': deal.get('login', 'N/A'),
+                    'Amount': float(deal.get('amount') or 0),
+                    'Date': deal.get('deal_time', 'N/A'),
+                    'Comment': deal.get('comment', 'N/A'),
+                    'Ticket': deal.get('ticket', 'N/A')
+                })
+            
+            # Prepare withdrawals sheet
+            for deal in withdrawals:
+                withdrawals_data.append({
+                    'Login': deal.get('login', 'N/A'),
+                    'Amount': abs(float(deal.get('amount') or 0)),
+                    'Date': deal.get('deal_time', 'N/A'),
+                    'Comment': deal.get('comment', 'N/A'),
+                    'Ticket': deal.get('ticket', 'N/A')
+                })
+            
+            # Prepare promotions sheet
+            for deal in promotions:
+                promotions_data.append({
+                    'Login': deal.get('login', 'N/A'),
+                    'Amount': float(deal.get('amount') or 0),
+                    'Date': deal.get('deal_time', 'N/A'),
+                    'Comment': deal.get('comment', 'N/A'),
+                    'Ticket': deal.get('ticket', 'N/A')
+                })
         
         # Prepare summary sheet
         summary_data = [
@@ -1025,12 +1269,13 @@ class ScheduledTaskManager:
         ]
         
         return {
-            'sheets': {
+            'sheets': {} if summary_only else {
                 'Deposits': deposits_data,
                 'Withdrawals': withdrawals_data,
                 'Promotions': promotions_data,
                 'Summary': summary_data
             },
+            'sheet_count': 4,
             'summary': f"Deals Report: {len(deposits)} deposits (${total_deposit_amount:,.2f}), {len(withdrawals)} withdrawals (${total_withdrawal_amount:,.2f}), {len(promotions)} promotions (${total_promotion_amount:,.2f})",
             'config_info': {
                 'name': config_name,
@@ -1040,34 +1285,40 @@ class ScheduledTaskManager:
             }
         }
     
-    def _prepare_monthly_summary_excel_data(self, results: list, config: dict, config_name: str) -> dict:
+    def _prepare_monthly_summary_excel_data(self, results: list, config: dict, config_name: str,
+                                            summary_only: bool = False) -> dict:
         """Prepare monthly summary data for Excel export"""
         if not results:
-            return {'sheets': {}, 'summary': 'No data available'}
+            return {'sheets': {}, 'sheet_count': 0, 'summary': 'No data available'}
         
-        # Calculate summary statistics
+        # Prepare main data sheet, accumulating summary statistics in the same pass
         total_logins = len(results)
-        total_balance = sum(float(r.get('balance', 0)) for r in results)
-        total_deposits = sum(float(r.get('monthly_deposits', 0)) for r in results)
-        total_withdrawals = sum(float(r.get('monthly_withdrawals', 0)) for r in results)
-        total_promotions = sum(float(r.get('monthly_promotions', 0)) for r in results)
-        net_flow = total_deposits - total_withdrawals + total_promotions
-        
-        # Prepare main data sheet
+        total_balance = total_deposits = total_withdrawals = total_promotions = 0.0
         main_data = []
         for record in results:
+            balance = float(record.get('balance') or 0)
+            d = float(record.get('monthly_deposits') or 0)
+            w = float(record.get('monthly_withdrawals') or 0)
+            p = float(record.get('monthly_promotions') or 0)
+            total_balance += balance
+            total_deposits += d
+            total_withdrawals += w
+            total_promotions += p
+            if summary_only:
+                continue
             main_data.append({
                 'Login': record.get('login', 'N/A'),
-                'Balance': float(record.get('balance', 0)),
-                'Monthly Deposits': float(record.get('monthly_deposits', 0)),
-                'Monthly Withdrawals': float(record.get('monthly_withdrawals', 0)),
-                'Monthly Promotions': float(record.get('monthly_promotions', 0)),
-                'Net Monthly Flow': float(record.get('monthly_deposits', 0)) - float(record.get('monthly_withdrawals', 0)) + float(record.get('monthly_promotions', 0)),
+                'Balance': balance,
+                'Monthly Deposits': d,
+                'Monthly Withdrawals': w,
+                'Monthly Promotions': p,
+                'Net Monthly Flow': d - w + p,
                 'Group': record.get('group', 'N/A'),
                 'Country': record.get('country', 'N/A'),
                 'Registration Date': record.get('registration', 'N/A'),
                 'Last Activity': record.get('last_activity', 'N/A')
             })
+        net_flow = total_deposits - total_withdrawals + total_promotions
         
         # Prepare summary sheet
         summary_data = [
@@ -1081,10 +1332,11 @@ class ScheduledTaskManager:
         ]
         
         return {
-            'sheets': {
+            'sheets': {} if summary_only else {
                 'Monthly Summary': main_data,
                 'Statistics': summary_data
             },
+            'sheet_count': 2,
             'summary': f"Monthly Summary: {total_logins} accounts, ${net_flow:,.2f} net flow",
             'config_info': {
                 'name': config_name,
@@ -1094,21 +1346,24 @@ class ScheduledTaskManager:
             }
         }
     
-    def _prepare_balance_excel_data(self, results: list, config: dict, config_name: str) -> dict:
+    def _prepare_balance_excel_data(self, results: list, config: dict, config_name: str,
+                                    summary_only: bool = False) -> dict:
         """Prepare balance report data for Excel export"""
         if not results:
-            return {'sheets': {}, 'summary': 'No data available'}
+            return {'sheets': {}, 'sheet_count': 0, 'summary': 'No data available'}
         
+        # Prepare main data sheet, accumulating the total balance in the same pass
         total_logins = len(results)
-        total_balance = sum(float(r.get('balance', 0)) for r in results)
-        avg_balance = total_balance / total_logins if total_logins > 0 else 0
-        
-        # Prepare main data sheet
+        total_balance = 0.0
         main_data = []
         for record in results:
+            balance = float(record.get('balance') or 0)
+            total_balance += balance
+            if summary_only:
+                continue
             main_data.append({
                 'Login': record.get('login', 'N/A'),
-                'Balance': float(record.get('balance', 0)),
+                'Balance': balance,
                 'Group': record.get('group', 'N/A'),
                 'Country': record.get('country', 'N/A'),
                 'Registration': record.get('registration', 'N/A'),
@@ -1116,9 +1371,10 @@ class ScheduledTaskManager:
             })
         
         return {
-            'sheets': {
+            'sheets': {} if summary_only else {
                 'Balance Report': main_data
             },
+            'sheet_count': 1,
             'summary': f"Balance Report: {total_logins} accounts, ${total_balance:,.2f} total balance",
             'config_info': {
                 'name': config_name,
@@ -1128,34 +1384,41 @@ class ScheduledTaskManager:
             }
         }
     
-    def _prepare_financial_excel_data(self, results: list, config: dict, config_name: str) -> dict:
+    def _prepare_financial_excel_data(self, results: list, config: dict, config_name: str,
+                                      summary_only: bool = False) -> dict:
         """Prepare financial report data for Excel export"""
         if not results:
-            return {'sheets': {}, 'summary': 'No data available'}
-        
-        total_deposits = sum(float(r.get('monthly_deposits', 0)) for r in results)
-        total_withdrawals = sum(float(r.get('monthly_withdrawals', 0)) for r in results)
-        total_promotions = sum(float(r.get('monthly_promotions', 0)) for r in results)
-        net_flow = total_deposits - total_withdrawals + total_promotions
+            return {'sheets': {}, 'sheet_count': 0, 'summary': 'No data available'}
         
-        # Prepare main data sheet
+        # Prepare main data sheet, accumulating totals in the same pass
+        total_deposits = total_withdrawals = total_promotions = 0.0
         main_data = []
         for record in results:
+            d = float(record.get('monthly_deposits') or 0)
+            w = float(record.get('monthly_withdrawals') or 0)
+            p = float(record.get('monthly_promotions') or 0)
+            total_deposits += d
+            total_withdrawals += w
+            total_promotions += p
+            if summary_only:
+                continue
             main_data.append({
                 'Login': record.get('login', 'N/A'),
-                'Monthly Deposits': float(record.get('monthly_deposits', 0)),
-                'Monthly Withdrawals': float(record.get('monthly_withdrawals', 0)),
-                'Monthly Promotions': float(record.get('monthly_promotions', 0)),
-                'Net Flow': float(record.get('monthly_deposits', 0)) - float(record.get('monthly_withdrawals', 0)) + float(record.get('monthly_promotions', 0)),
-                'Deposit Count': int(record.get('deposit_count', 0)),
-                'Withdrawal Count': int(record.get('withdrawal_count', 0)),
-                'Promotion Count': int(record.get('promotion_count', 0))
+                'Monthly Deposits': d,
+                'Monthly Withdrawals': w,
+                'Monthly Promotions': p,
+                'Net Flow': d - w + p,
+                'Deposit Count': int(record.get('deposit_count') or 0),
+                'Withdrawal Count': int(record.get('withdrawal_count') or 0),
+                'Promotion Count': int(record.get('promotion_count') or 0)
             })
+        net_flow = total_deposits - total_withdrawals + total_promotions
         
         return {
-            'sheets': {
+            'sheets': {} if summary_only else {
                 'Financial Report': main_data
             },
+            'sheet_count': 1,
             'summary': f"Financial Report: ${net_flow:,.2f} net flow, {len(results)} accounts",
             'config_info': {
                 'name': config_name,
@@ -1165,30 +1428,37 @@ class ScheduledTaskManager:
             }
         }
     
-    def _prepare_transaction_excel_data(self, results: list, config: dict, config_name: str) -> dict:
+    def _prepare_transaction_excel_data(self, results: list, config: dict, config_name: str,
+                                        summary_only: bool = False) -> dict:
         """Prepare transaction report data for Excel export"""
         if not results:
-            return {'sheets': {}, 'summary': 'No data available'}
-        
-        total_transactions = sum(int(r.get('total_transactions', 0)) for r in results)
-        total_volume = sum(float(r.get('total_volume', 0)) for r in results)
+            return {'sheets': {}, 'sheet_count': 0, 'summary': 'No data available'}
         
-        # Prepare main data sheet
+        # Prepare main data sheet, accumulating totals in the same pass
+        total_transactions = 0
+        total_volume = 0.0
         main_data = []
         for record in results:
+            transactions = int(record.get('total_transactions') or 0)
+            volume = float(record.get('total_volume') or 0)
+            total_transactions += transactions
+            total_volume += volume
+            if summary_only:
+                continue
             main_data.append({
                 'Login': record.get('login', 'N/A'),
-                'Total Transactions': int(record.get('total_transactions', 0)),
-                'Total Volume': float(record.get('total_volume', 0)),
-                'Average Transaction': float(record.get('total_volume', 0)) / max(int(record.get('total_transactions', 1)), 1),
+                'Total Transactions': transactions,
+                'Total Volume': volume,
+                'Average Transaction': volume / max(transactions, 1),
                 'Group': record.get('group', 'N/A'),
                 'Last Transaction Date': record.get('last_transaction_date', 'N/A')
             })
         
         return {
-            'sheets': {
+            'sheets': {} if summary_only else {
                 'Transaction Report': main_data
             },
+            'sheet_count': 1,
             'summary': f"Transaction Report: {total_transactions:,} transactions, ${total_volume:,.2f} volume",
             'config_info': {
                 'name': config_name,
@@ -1200,116 +1470,25 @@ class ScheduledTaskManager:
     
     def _format_excel_summary_for_telegram(self, excel_data: dict, config: dict, config_name: str) -> str:
         """Format Excel summary message for Telegram"""
-        config_info = excel_data.get('config_info', {})
-        summary = excel_data.get('summary', 'Report generated')
-        
-        message = f"""📊 <b>Scheduled Report Generated</b>
-🔧 <b>Configuration:</b> {config_name}
-🗄️ <b>Database:</b> {config_info.get('database', 'Unknown').upper()}
-📋 <b>Report Type:</b> {config_info.get('report_type', 'Unknown')}
-👥 <b>Groups:</b> {config_info.get('groups', 0)} selected
-⏰ <b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-📈 <b>Summary:</b>
-{summary}
-
-📎 <b>Excel file attached with detailed data</b>
+        config_info = excel_data.get('config_info') or {}
+        sheet_count = excel_data.get('sheet_count')
+        if sheet_count is None:
+            sheet_count = len(excel_data.get('sheets', {}))
+        
+        return _EXCEL_SUMMARY_TEMPLATE.format(
+            config_name=config_name,
+            database=config_info.get('database', 'Unknown').upper(),
+            report_type=config_info.get('report_type', 'Unknown'),
+            groups=config_info.get('groups', 0),
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            summary=excel_data.get('summary', 'Report generated'),
+            min_login=config.get('min_login', 'N/A'),
+            max_login=config.get('max_login', 'N/A'),
+            limit=config.get('limit', 'No limit'),
+            sheet_count=sheet_count,
+        )
 
-🔢 <b>Configuration Details:</b>
-• Login Range: {config.get('min_login', 'N/A')} - {config.get('max_login', 'N/A')}
-• Record Limit: {config.get('limit', 'No limit')}
-• Total Sheets: {len(excel_data.get('sheets', {}))}"""
 
-        return message
-
-def main():
-    """Main function to handle command line interface"""
-    scheduler = ScheduledTaskManager()
-    
-    while True:
-        print("\n🕐 Scheduled Task Manager")
-        print("=" * 50)
-        
-        # Show scheduler status
-        status = scheduler.get_scheduler_status()
-        scheduler_status = "🟢 Running" if status['running'] else "🔴 Stopped"
-        print(f"Scheduler Status: {scheduler_status}")
-        print(f"Tasks: {status['active_tasks']}/{status['total_tasks']} active")
-        
-        choices = [
-            "Create New Task",
-            "List Tasks",
-            "Execute Task",
-            "Toggle Task (Enable/Disable)",
-            "Delete Task",
-            "Start Scheduler" if not status['running'] else "Stop Scheduler",
-            "Setup Telegram Integration",
-            "Exit"
-        ]
-        
-        questions = [
-            inquirer.List('action',
-                         message="Select an action",
-                         choices=choices)
-        ]
-        
-        try:
-            answers = inquirer.prompt(questions)
-            if not answers:
-                break
-            
-            action = answers['action']
-            
-            if action == "Create New Task":
-                scheduler.create_task()
-            
-            elif action == "List Tasks":
-                scheduler.list_tasks()
-            
-            elif action == "Execute Task":
-                if scheduler.tasks:
-                    task_choices = list(scheduler.tasks.keys())
-                    task_questions = [
-                        inquirer.List('task_name',
-                                     message="Select task to execute",
-                                     choices=task_choices)
-                    ]
-                    task_answers = inquirer.prompt(task_questions)
-                    if task_answers:
-                        scheduler.execute_task(task_answers['task_name'])
-                else:
-                    print("No tasks available.")
-            
-            elif action == "Toggle Task (Enable/Disable)":
-                scheduler.toggle_task()
-            
-            elif action == "Delete Task":
-                scheduler.delete_task()
-            
-            elif action == "Start Scheduler":
-                scheduler.start_scheduler()
-            
-            elif action == "Stop Scheduler":
-                scheduler.stop_scheduler_service()
-            
-            elif action == "Setup Telegram Integration":
-                scheduler.telegram_integration.setup_telegram_integration()
-            
-            elif action == "Exit":
-                if status['running']:
-                    print("🛑 Stopping scheduler before exit...")
-                    scheduler.stop_scheduler_service()
-                    time.sleep(2)
-                print("👋 Goodbye!")
-                break
-            
-            # Wait for user input before continuing
-            if action != "Exit":
-                input("\nPress Enter to continue...")
-                
-        except KeyboardInterrupt:
-            print("\n👋 Goodbye!")
-            break
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            input("\nPress Enter to continue...")
\ No newline at end of file
+if __name__ == "__main__":
+    from scheduler_cli import main
+    main()
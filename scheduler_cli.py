@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Scheduled Task Manager CLI
+Interactive prompts for creating and managing scheduled tasks
+"""
+
+import inquirer
+from datetime import datetime
+from scheduler import ScheduledTaskManager
+
+
+def create_task(manager) -> bool:
+    """Interactively create a new scheduled task"""
+    print("\n📅 Create New Scheduled Task")
+    print("=" * 50)
+    
+    # Check if Telegram is configured
+    telegram_status = manager.telegram_integration.get_telegram_status()
+    if not telegram_status['configured']:
+        print("❌ Telegram integration not configured!")
+        print("Please setup Telegram integration first.")
+        return False
+    
+    try:
+        # First ask basic questions
+        basic_questions = [
+            inquirer.Text('task_name', message="Enter task name (unique identifier)"),
+            inquirer.Text('description', message="Enter task description"),
+            inquirer.List('report_type', 
+                         message="Select report type",
+                         choices=['Saved Configuration Report'])
+        ]
+        
+        basic_answers = inquirer.prompt(basic_questions)
+        if not basic_answers:
+            print("❌ Task creation cancelled")
+            return False
+        
+        # Initialize answers dict
+        answers = basic_answers.copy()
+        
+        # For saved configuration, database will come from config
+        answers['database'] = 'from_config'
+        
+        # Ask remaining questions
+        remaining_questions = [
+            inquirer.Text('chat_id', message="Enter Telegram chat ID (group or private)"),
+            inquirer.Text('send_time', message="Enter send time (HH:MM format, e.g., 09:30)"),
+            inquirer.List('frequency', 
+                         message="Select frequency",
+                         choices=['Daily', 'Weekly', 'Monthly']),
+            inquirer.Confirm('active', message="Activate this task immediately?", default=True)
+        ]
+        
+        remaining_answers = inquirer.prompt(remaining_questions)
+        if not remaining_answers:
+            print("❌ Task creation cancelled")
+            return False
+        
+        answers.update(remaining_answers)
+        
+        # Get saved configuration
+        saved_configs = manager._get_all_saved_configs()
+        if not saved_configs:
+            print("❌ No saved configurations found!")
+            print("Please create a configuration first using the main task creator.")
+            return False
+        
+        config_choices = []
+        for name, config in saved_configs.items():
+            groups_info = f"{len(config.get('groups', []))} groups" if config.get('groups') else "All groups"
+            database = config.get('database', 'Unknown')
+            report_type = config.get('report_type', 'Unknown')
+            choice_text = f"{name} - {database} - {groups_info} - {report_type}"
+            config_choices.append((choice_text, name))
+        
+        config_question = [
+            inquirer.List('config_name',
+                         message="Select saved configuration to use",
+                         choices=config_choices)
+        ]
+        
+        config_answer = inquirer.prompt(config_question)
+        if not config_answer:
+            print("❌ Configuration selection cancelled")
+            return False
+        
+        saved_config_name = config_answer['config_name']
+        selected_config = saved_configs[saved_config_name]
+        
+        # Update database from configuration
+        answers['database'] = selected_config.get('database', 'mt5gn_live')
+        
+        print(f"✓ Selected configuration: {saved_config_name}")
+        print(f"   📊 Report Type: {selected_config.get('report_type', 'Unknown')}")
+        print(f"   🗄️ Database: {answers['database']}")
+        print(f"   👥 Groups: {len(selected_config.get('groups', []))} selected" if selected_config.get('groups') else "   👥 Groups: All groups")
+        print(f"   🔢 Login Range: {selected_config.get('min_login', 'N/A')} - {selected_config.get('max_login', 'N/A')}")
+        print(f"   📋 Record Limit: {selected_config.get('limit', 'N/A')}")
+        
+        # Validate task name uniqueness
+        if answers['task_name'] in manager.tasks:
+            print(f"❌ Task '{answers['task_name']}' already exists!")
+            return False
+        
+        # Validate time format
+        try:
+            time_parts = answers['send_time'].split(':')
+            if len(time_parts) != 2:
+                raise ValueError("Invalid time format")
+            hour, minute = int(time_parts[0]), int(time_parts[1])
+            if not (0 <= hour <= 23 and 0 <= minute <= 59):
+                raise ValueError("Invalid time values")
+        except ValueError:
+            print("❌ Invalid time format! Please use HH:MM format (e.g., 09:30)")
+            return False
+        
+        # Test chat ID
+        print(f"\n🔍 Testing chat ID {answers['chat_id']}...")
+        test_message = f"🤖 Task Creator Test\n\nTesting connection for scheduled task: {answers['task_name']}"
+        
+        if not manager.telegram_integration.send_telegram_message(test_message, chat_id=answers['chat_id']):
+            print("❌ Failed to send test message to chat ID")
+            confirm = inquirer.confirm("Continue anyway?", default=False)
+            if not confirm:
+                return False
+        else:
+            print("✓ Test message sent successfully!")
+        
+        # Create task object
+        task = {
+            'task_name': answers['task_name'],
+            'description': answers['description'],
+            'report_type': answers['report_type'],
+            'database': answers['database'],
+            'chat_id': answers['chat_id'],
+            'send_time': answers['send_time'],
+            'frequency': answers['frequency'],
+            'active': answers['active'],
+            'created_at': datetime.now().isoformat(),
+            'last_run': None,
+            'next_run': manager._calculate_next_run(answers['send_time'], answers['frequency']),
+            'run_count': 0,
+            'saved_config_name': saved_config_name  # Store the configuration name
+        }
+        
+        # Save task
+        if manager.add_task(task):
+            print(f"✓ Task '{answers['task_name']}' created successfully!")
+            if answers['active']:
+                print(f"📅 Next run scheduled for: {task['next_run']}")
+            return True
+        else:
+            print("❌ Failed to save task")
+            return False
+            
+    except KeyboardInterrupt:
+        print("\n❌ Task creation cancelled")
+        return False
+    except Exception as e:
+        print(f"❌ Error creating task: {e}")
+        return False
+
+
+def select_task(manager, message: str) -> str:
+    """Prompt for one of the existing tasks; returns None when cancelled"""
+    questions = [
+        inquirer.List('task_name',
+                     message=message,
+                     choices=list(manager.tasks.keys()))
+    ]
+    answers = inquirer.prompt(questions)
+    return answers['task_name'] if answers else None
+
+
+def select_task_to_delete(manager) -> str:
+    """Prompt for a task to delete and confirm; returns None when cancelled"""
+    questions = [
+        inquirer.List('task_name', 
+                     message="Select task to delete",
+                     choices=list(manager.tasks.keys())),
+        inquirer.Confirm('confirm', message="Are you sure you want to delete this task?", default=False)
+    ]
+    answers = inquirer.prompt(questions)
+    if not answers or not answers['confirm']:
+        return None
+    return answers['task_name']
+
+
+def execute_selected_task(manager):
+    """Prompt for a task and execute it now"""
+    if not manager.tasks:
+        print("No tasks available.")
+        return
+    
+    task_questions = [
+        inquirer.List('task_name',
+                     message="Select task to execute",
+                     choices=list(manager.tasks.keys()))
+    ]
+    task_answers = inquirer.prompt(task_questions)
+    if task_answers:
+        manager.execute_task(task_answers['task_name'])
+
+
+# Main menu; the scheduler slot is swapped between Start and Stop on each pass
+_MENU_CHOICES = (
+    "Create New Task",
+    "List Tasks",
+    "Execute Task",
+    "Toggle Task (Enable/Disable)",
+    "Delete Task",
+    "Start Scheduler",
+    "Setup Telegram Integration",
+    "Exit",
+)
+_SCHEDULER_SLOT = _MENU_CHOICES.index("Start Scheduler")
+
+
+def main():
+    """Main function to handle command line interface"""
+    scheduler = ScheduledTaskManager()
+    
+    choices = list(_MENU_CHOICES)
+    actions = {
+        "Create New Task": scheduler.create_task,
+        "List Tasks": scheduler.list_tasks,
+        "Execute Task": lambda: execute_selected_task(scheduler),
+        "Toggle Task (Enable/Disable)": scheduler.toggle_task,
+        "Delete Task": scheduler.delete_task,
+        "Start Scheduler": scheduler.start_scheduler,
+        "Stop Scheduler": scheduler.stop_scheduler_service,
+        "Setup Telegram Integration": scheduler.telegram_integration.setup_telegram_integration,
+    }
+    
+    while True:
+        print("\n🕐 Scheduled Task Manager")
+        print("=" * 50)
+        
+        # Show scheduler status
+        status = scheduler.get_scheduler_status()
+        scheduler_status = "🟢 Running" if status['running'] else "🔴 Stopped"
+        print(f"Scheduler Status: {scheduler_status}")
+        print(f"Tasks: {status['active_tasks']}/{status['total_tasks']} active")
+        
+        choices[_SCHEDULER_SLOT] = "Stop Scheduler" if status['running'] else "Start Scheduler"
+        questions = [
+            inquirer.List('action',
+                         message="Select an action",
+                         choices=choices)
+        ]
+        
+        try:
+            answers = inquirer.prompt(questions)
+            if not answers:
+                break
+            
+            action = answers['action']
+            
+            if action == "Exit":
+                if status['running']:
+                    print("🛑 Stopping scheduler before exit...")
+                scheduler.close()
+                print("👋 Goodbye!")
+                break
+            
+            actions[action]()
+            
+            # Wait for user input before continuing
+            input("\nPress Enter to continue...")
+                
+        except KeyboardInterrupt:
+            scheduler.close()
+            print("\n👋 Goodbye!")
+            break
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            input("\nPress Enter to continue...")
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,115 @@ Task Creator - Main CLI Application
 Modular version with separate components for better maintainability
 """
 
+import io
 import os
 import sys
 import subprocess
 import re
+import importlib
+import contextlib
+import textwrap
+import traceback
+import functools
+from itertools import zip_longest
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import inquirer
-from tabulate import tabulate
+from typing import List, Dict, Optional, Tuple
 
 # Import our modular components
-from config_manager import ConfigManager
-from database_manager import DatabaseManager
+from config_manager import ConfigManager, get_python_command, parse_saved_at
+from database_manager import DatabaseManager, DB_CONFIGS
 from telegram_bot import TelegramIntegration
 from excel_exporter import ExcelExporter
 from scheduler import ScheduledTaskManager
 
 
+# Comma-separated login IDs, each above 9999 (leading zeros allowed, as int() would accept)
+_LOGIN_IDS_RE = re.compile(r'\s*0*[1-9]\d{4,}\s*(?:,\s*0*[1-9]\d{4,}\s*)*')
+
+# Single login ID above 9999 and a plain non-negative integer, checked on every keystroke
+_LOGIN_ID_RE = re.compile(r'0*[1-9]\d{4,}')
+_DIGITS_RE = re.compile(r'\d+')
+
+# Send time as H:MM or HH:MM within a day (single digits accepted, as the old int() parse did)
+_TIME_RE = re.compile(r'([01]?\d|2[0-3]):[0-5]?\d')
+
+# Group status is printed as plain columns instead of a tabulate grid for ASCII-only
+# group names, or for any list longer than this many rows
+_PLAIN_STATUS_ROWS = 200
+_STATUS_COL_WIDTH = 37
+
+# Regex examples for _add_groups_by_regex, each written in one call
+_REGEX_HELP = (
+    "\n💡 Regex Pattern Examples:\n"
+    "   GANN.*          - Groups starting with 'GANN'\n"
+    "   .*REAL.*        - Groups containing 'REAL'\n"
+    "   GANN-TR\\\\G_SF.* - Groups starting with 'GANN-TR\\G_SF'\n"
+    "   .*_SF_.*        - Groups containing '_SF_'\n"
+    "   ^DEMO.*         - Groups starting with 'DEMO'\n"
+    "   .*TEST$         - Groups ending with 'TEST'\n"
+)
+_REGEX_MORE_HELP = (
+    "\n🎯 More Regex Examples:\n"
+    "   MT5.*           - Groups starting with 'MT5'\n"
+    "   .*LIVE.*        - Groups containing 'LIVE'\n"
+    "   .*-REAL$        - Groups ending with '-REAL'\n"
+    "   ^[A-Z]{4}.*     - Groups starting with 4 uppercase letters\n"
+    "   .*[0-9]+.*      - Groups containing numbers\n"
+    "   (DEMO|TEST).*   - Groups starting with 'DEMO' or 'TEST'\n"
+    "   .*_(SF|LC)_.*   - Groups containing '_SF_' or '_LC_'\n"
+)
+
+# Fixed entries of the scheduled task menu; the scheduler toggle and back entries follow them
+_SCHEDULED_TASK_OPTIONS = (
+    "📅 Create New Scheduled Task",
+    "📋 List All Scheduled Tasks",
+    "🚀 Execute Task Manually",
+    "🔄 Toggle Task (Enable/Disable)",
+    "🗑️ Delete Task",
+    "📊 Task Monitoring Dashboard",
+)
+
+# Database menu labels mapped to their DB_CONFIGS key, built once at import
+_DATABASE_CHOICES = {
+    f"{db_name} - {config['database']} at {config['host']}": db_name
+    for db_name, config in DB_CONFIGS.items()
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_icase(pattern: str):
+    """Compile a group pattern once; validation and matching share the result"""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _output_preview(output: str, edge: int = 10) -> str:
+    """First and last `edge` lines of long report output, located without splitting all of it"""
+    text = output.strip()
+    total = text.count('\n') + 1
+    if total <= 2 * edge:
+        return output
+    head_end = -1
+    for _ in range(edge):
+        head_end = text.find('\n', head_end + 1)
+    tail_start = len(text)
+    for _ in range(edge):
+        tail_start = text.rfind('\n', 0, tail_start)
+    return f"{text[:head_end]}\n... ({total - 2 * edge} more lines) ...\n{text[tail_start + 1:]}"
+
+
+def _render_kv_table(rows: List[List[str]], headers: List[str]) -> str:
+    """Two-column text table laid out like tabulate's "grid" format for plain string cells"""
+    w1 = max(len(k) for k, _ in [headers, *rows])
+    w2 = max(len(v) for _, v in [headers, *rows])
+    border = f"+{'-' * (w1 + 2)}+{'-' * (w2 + 2)}+"
+    lines = [border, f"| {headers[0].ljust(w1)} | {headers[1].ljust(w2)} |", border.replace('-', '=')]
+    for k, v in rows:
+        lines.append(f"| {k.ljust(w1)} | {v.ljust(w2)} |")
+        lines.append(border)
+    return "\n".join(lines)
+
+
 class TaskCreator:
     def __init__(self):
         """Initialize the task creator with proper Python command detection"""
@@ -38,22 +130,23 @@ class TaskCreator:
         # Initialize configuration
         self.selected_config = {}
         self.execution_results = []
+        
+        # Run report scripts' main() in this interpreter instead of spawning Python per report.
+        # The stdout/stderr redirect is process-wide, so this is skipped while the scheduler
+        # thread runs (its prints would land in the report output). Report modules are imported
+        # once and reused, so module-level state (DB_CONFIGS, the Windows stdout wrapper) persists
+        # between runs; set False to always isolate them in a subprocess.
+        self._inproc_reports = True
+        
+        # Per-database query results reused for the rest of the session
+        self._groups_cache: Dict[str, List[str]] = {}
+        self._login_range_cache: Dict[tuple, Dict] = {}
+        self._groups_ascii_only = False
+        self._opt_info_cache: Dict[tuple, str] = {}
     
     def _get_python_command(self):
         """Get the correct Python command for current OS"""
-        if sys.platform == "win32":
-            # Test different Python commands on Windows
-            test_commands = ["python", "python3", "py"]
-            for cmd in test_commands:
-                try:
-                    result = subprocess.run([cmd, "--version"], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        return cmd
-                except:
-                    continue
-            return "python"  # Default fallback
-        else:
-            return "python3"  # Unix/Linux/macOS
+        return get_python_command()
     
     def show_welcome(self):
         """Show welcome message"""
@@ -65,6 +158,7 @@ class TaskCreator:
     
     def show_main_menu(self):
         """Show main menu with all options"""
+        import inquirer
         while True:
             telegram_status = self.telegram.get_telegram_status()
             telegram_option = f"Telegram Integration ({'✓ Active' if telegram_status['configured'] else '❌ Not Setup'})"
@@ -108,6 +202,7 @@ class TaskCreator:
     
     def manage_configurations(self):
         """Handle configuration management"""
+        import inquirer
         while True:
             options = [
                 "📋 List All Configurations",
@@ -134,11 +229,15 @@ class TaskCreator:
     def run_report_creation(self):
         """Run the main report creation workflow"""
         try:
-            # Step 0: Check for saved configurations and offer to load
-            success, self.selected_config = self.config_manager.handle_saved_configs(self.selected_config)
-            if not success:
-                print("❌ Configuration loading cancelled")
-                return
+            # Step 0: Offer to repeat the last session, else check saved configurations
+            last_session = self.config_manager.offer_last_session()
+            if last_session:
+                self.selected_config = last_session
+            else:
+                success, self.selected_config = self.config_manager.handle_saved_configs(self.selected_config)
+                if not success:
+                    print("❌ Configuration loading cancelled")
+                    return
             
             # Step 1: Select database (skip if loaded from config)
             if 'database' not in self.selected_config:
@@ -146,35 +245,38 @@ class TaskCreator:
                     print("❌ Database selection cancelled")
                     return
             
-            # Connect to selected database
-            if not self.db_manager.connect_to_database(self.selected_config['database']):
-                print("❌ Database connection failed")
-                return
-            
-            # Step 2: Select group (skip if loaded from config)
-            if 'groups' not in self.selected_config:
-                if not self.select_group():
-                    print("❌ Group selection cancelled")
-                    return
-            
-            # Step 3: Select login range (skip if loaded from config)
-            if 'min_login' not in self.selected_config or 'max_login' not in self.selected_config:
-                if not self.select_login_range():
-                    print("❌ Login range selection cancelled")
-                    return
-            
-            # Step 4: Select report type (skip if loaded from config)
+            # Step 2: Select report type (skip if loaded from config)
             if 'report_type' not in self.selected_config:
                 if not self.select_report_type():
                     print("❌ Report type selection cancelled")
                     return
             
-            # Step 5: Additional options (skip if loaded from config)
+            # Step 3: Additional options (skip if loaded from config)
             if 'limit' not in self.selected_config:
                 if not self.select_additional_options():
                     print("❌ Additional options cancelled")
                     return
             
+            # The remaining steps query the database; connect only now, and only if one of them runs
+            needs_groups = 'groups' not in self.selected_config
+            needs_range = 'min_login' not in self.selected_config or 'max_login' not in self.selected_config
+            if needs_groups or needs_range:
+                if not self.db_manager.connect_to_database(self.selected_config['database']):
+                    print("❌ Database connection failed")
+                    return
+            
+            # Step 4: Select group (skip if loaded from config)
+            if needs_groups:
+                if not self.select_group():
+                    print("❌ Group selection cancelled")
+                    return
+            
+            # Step 5: Select login range (skip if loaded from config)
+            if needs_range:
+                if not self.select_login_range():
+                    print("❌ Login range selection cancelled")
+                    return
+            
             # Step 6: Show summary and confirm
             if not self.show_configuration_summary():
                 print("❌ Task execution cancelled")
@@ -189,6 +291,7 @@ class TaskCreator:
             
             # Step 9: Offer to save configuration
             self.config_manager.offer_save_config(self.selected_config)
+            self.config_manager.save_last_session(self.selected_config)
             
         except KeyboardInterrupt:
             print("\n❌ Task creator interrupted by user")
@@ -197,15 +300,32 @@ class TaskCreator:
         finally:
             self.db_manager.close_connection()
     
+    def _get_available_groups(self) -> List[str]:
+        """Available groups for the selected database, queried once per session"""
+        database = self.selected_config['database']
+        groups = self._groups_cache.get(database)
+        if groups is None:
+            groups = self.db_manager.get_available_groups()
+            if groups:
+                self._groups_cache[database] = groups
+        return groups
+    
+    def _get_login_range(self, groups: Optional[List[str]]) -> Dict:
+        """Login range for the selected database and groups, queried once per session"""
+        key = (self.selected_config['database'], tuple(groups) if groups else None)
+        range_info = self._login_range_cache.get(key)
+        if range_info is None:
+            range_info = self.db_manager.get_login_range(groups)
+            if range_info['total_logins']:
+                self._login_range_cache[key] = range_info
+        return range_info
+    
     def select_database(self):
         """Interactive database selection"""
+        import inquirer
         print("🗄️  Select database to analyze...")
         
-        from database_manager import DB_CONFIGS
-        
-        database_choices = []
-        for db_name, config in DB_CONFIGS.items():
-            database_choices.append(f"{db_name} - {config['database']} at {config['host']}")
+        database_choices = list(_DATABASE_CHOICES)
         
         questions = [
             inquirer.List('database',
@@ -218,8 +338,7 @@ class TaskCreator:
         if not answers:
             return False
         
-        # Extract database name from selection
-        selected_db = answers['database'].split(' - ')[0]
+        selected_db = _DATABASE_CHOICES[answers['database']]
         self.selected_config['database'] = selected_db
         
         print(f"✓ Selected database: {selected_db}")
@@ -227,8 +346,9 @@ class TaskCreator:
     
     def select_group(self):
         """Interactive group selection with regex support and multi-column display"""
+        import inquirer
         print("\n👥 Getting available login groups...")
-        available_groups = self.db_manager.get_available_groups()
+        available_groups = self._get_available_groups()
         
         if not available_groups:
             print("❌ No groups found in database")
@@ -236,6 +356,9 @@ class TaskCreator:
         
         selected_groups = []
         removed_logins = []  # Track individually removed logins
+        groups_lower = {g: g.lower() for g in available_groups}  # For case-insensitive search
+        # Selected groups come from available_groups, so one check covers both status columns
+        self._groups_ascii_only = all(g.isascii() for g in available_groups)
         
         while True:
             self._show_group_status(available_groups, selected_groups, removed_logins)
@@ -265,7 +388,7 @@ class TaskCreator:
             if "Add groups by regex" in action:
                 self._add_groups_by_regex(available_groups, selected_groups)
             elif "Add individual groups" in action:
-                self._add_individual_groups_with_search(available_groups, selected_groups)
+                self._add_individual_groups_with_search(available_groups, selected_groups, groups_lower)
             elif "Remove selected groups" in action:
                 self._remove_selected_groups(selected_groups)
             elif "Remove individual login" in action:
@@ -291,25 +414,31 @@ class TaskCreator:
     
     def _show_group_status(self, available_groups: List[str], selected_groups: List[str], removed_logins: List[str] = None):
         """Show current group selection status in two columns"""
+        from tabulate import tabulate
         print("\n" + "=" * 80)
         print("📊 GROUP SELECTION STATUS")
         print("=" * 80)
         
-        # Prepare data for two-column display
-        max_rows = max(len(available_groups), len(selected_groups))
-        
-        table_data = []
-        for i in range(max_rows):
-            available = available_groups[i] if i < len(available_groups) else ""
-            selected = selected_groups[i] if i < len(selected_groups) else ""
-            table_data.append([available, selected])
-        
         headers = [
             f"Available Groups ({len(available_groups)})",
             f"Selected Groups ({len(selected_groups)})"
         ]
-        
-        print(tabulate(table_data, headers=headers, tablefmt="grid", maxcolwidths=[35, 35]))
+        rows = zip_longest(available_groups, selected_groups, fillvalue="")
+        
+        if self._groups_ascii_only or max(len(available_groups), len(selected_groups)) > _PLAIN_STATUS_ROWS:
+            # str.ljust is exact for ASCII and skips tabulate's per-character display-width lookups
+            w = _STATUS_COL_WIDTH
+            lines = [f"{headers[0].ljust(w)} | {headers[1].ljust(w)}", f"{'-' * w}-+-{'-' * w}"]
+            for available, selected in rows:
+                if len(available) <= w and len(selected) <= w:
+                    lines.append(f"{available.ljust(w)} | {selected.ljust(w)}")
+                else:
+                    # Wrap long names over several lines, as the grid did, rather than cutting them
+                    wrapped = zip_longest(textwrap.wrap(available, w) or [""], textwrap.wrap(selected, w) or [""], fillvalue="")
+                    lines.extend(f"{a.ljust(w)} | {b.ljust(w)}" for a, b in wrapped)
+            print("\n".join(lines))
+        else:
+            print(tabulate(list(rows), headers=headers, tablefmt="grid", maxcolwidths=[35, 35]))
         
         # Show removed logins if any
         if removed_logins:
@@ -321,21 +450,20 @@ class TaskCreator:
     
     def _add_groups_by_regex(self, available_groups: List[str], selected_groups: List[str]) -> bool:
         """Add groups using regex pattern"""
+        import inquirer
         # Filter out already selected groups
-        available_unselected = [g for g in available_groups if g not in selected_groups]
+        selected = set(selected_groups)
+        available_unselected = [g for g in available_groups if g not in selected]
         
         if not available_unselected:
             print("❌ No unselected groups available to add")
             return False
         
+        help_shown = False
         while True:
-            print("\n💡 Regex Pattern Examples:")
-            print("   GANN.*          - Groups starting with 'GANN'")
-            print("   .*REAL.*        - Groups containing 'REAL'")
-            print("   GANN-TR\\\\G_SF.* - Groups starting with 'GANN-TR\\G_SF'")
-            print("   .*_SF_.*        - Groups containing '_SF_'")
-            print("   ^DEMO.*         - Groups starting with 'DEMO'")
-            print("   .*TEST$         - Groups ending with 'TEST'")
+            if not help_shown:
+                sys.stdout.write(_REGEX_HELP)
+                help_shown = True
             
             options = [
                 "✏️ Enter regex pattern",
@@ -354,14 +482,7 @@ class TaskCreator:
                 return False
             
             if "Show more examples" in answers['choice']:
-                print("\n🎯 More Regex Examples:")
-                print("   MT5.*           - Groups starting with 'MT5'")
-                print("   .*LIVE.*        - Groups containing 'LIVE'")
-                print("   .*-REAL$        - Groups ending with '-REAL'")
-                print("   ^[A-Z]{4}.*     - Groups starting with 4 uppercase letters")
-                print("   .*[0-9]+.*      - Groups containing numbers")
-                print("   (DEMO|TEST).*   - Groups starting with 'DEMO' or 'TEST'")
-                print("   .*_(SF|LC)_.*   - Groups containing '_SF_' or '_LC_'")
+                sys.stdout.write(_REGEX_MORE_HELP)
                 input("\nPress Enter to continue...")
                 continue
             
@@ -379,8 +500,8 @@ class TaskCreator:
             pattern = answers['pattern']
             
             try:
-                regex = re.compile(pattern, re.IGNORECASE)
-                matched_groups = [g for g in available_unselected if regex.search(g)]
+                regex = _compile_icase(pattern)
+                matched_groups = list(filter(regex.search, available_unselected))
                 
                 if matched_groups:
                     print(f"\n✓ Found {len(matched_groups)} groups matching pattern '{pattern}':")
@@ -418,17 +539,24 @@ class TaskCreator:
             if not answers or not answers['retry']:
                 return False
     
-    def _validate_regex_with_feedback(self, pattern: str) -> bool:
-        """Validate regex pattern with helpful feedback"""
+    def _regex_error(self, pattern: str) -> Optional[str]:
+        """Return why a group pattern is unusable, or None if it compiles"""
         if not pattern.strip():
-            print("❌ Pattern cannot be empty")
-            return False
-        
+            return "Pattern cannot be empty"
         try:
-            re.compile(pattern)
-            return True
+            _compile_icase(pattern)
+            return None
         except re.error as e:
-            print(f"❌ Invalid regex: {e}")
+            return f"Invalid regex: {e}"
+    
+    def _validate_regex_with_feedback(self, pattern: str) -> bool:
+        """Validate regex pattern with helpful feedback"""
+        error = self._regex_error(pattern)
+        if error is None:
+            return True
+        
+        print(f"❌ {error}")
+        if pattern.strip():
             print("💡 Quick fixes:")
             if '\\G' in pattern:
                 print("   - \\G is a special regex character, use \\\\G for literal \\G")
@@ -442,22 +570,19 @@ class TaskCreator:
                 print("   - Unclosed parenthesis ( - add closing )")
             if '{' in pattern and '}' not in pattern:
                 print("   - Unclosed brace { - add closing }")
-            return False
+        return False
     
     def _validate_regex(self, pattern: str) -> bool:
         """Simple regex validation"""
-        if not pattern.strip():
-            return False
-        try:
-            re.compile(pattern)
-            return True
-        except re.error:
-            return False
+        return self._regex_error(pattern) is None
     
-    def _add_individual_groups_with_search(self, available_groups: List[str], selected_groups: List[str]) -> bool:
+    def _add_individual_groups_with_search(self, available_groups: List[str], selected_groups: List[str],
+                                           groups_lower: Dict[str, str] = None) -> bool:
         """Add individual groups with search functionality"""
+        import inquirer
         # Filter out already selected groups
-        available_unselected = [g for g in available_groups if g not in selected_groups]
+        selected = set(selected_groups)
+        available_unselected = [g for g in available_groups if g not in selected]
         
         if not available_unselected:
             print("❌ No unselected groups available to add")
@@ -483,7 +608,7 @@ class TaskCreator:
                 return False
             
             if "Search and filter" in answers['choice']:
-                result = self._search_and_select_groups(available_unselected, selected_groups)
+                result = self._search_and_select_groups(available_unselected, selected_groups, groups_lower)
                 if result:
                     return True
                 # If search returns False, continue the loop to allow new search
@@ -493,8 +618,14 @@ class TaskCreator:
                     return True
                 # If paginated selection returns False, continue the loop
     
-    def _search_and_select_groups(self, available_groups: List[str], selected_groups: List[str]) -> bool:
+    def _search_and_select_groups(self, available_groups: List[str], selected_groups: List[str],
+                                  groups_lower: Dict[str, str] = None) -> bool:
         """Search and select groups with filtering"""
+        import inquirer
+        # Lowercased names, normally built once per group selection by select_group
+        if groups_lower is None:
+            groups_lower = {g: g.lower() for g in available_groups}
+        
         while True:
             questions = [
                 inquirer.Text('search_term',
@@ -510,7 +641,8 @@ class TaskCreator:
             
             if search_term:
                 # Filter groups by search term
-                filtered_groups = [g for g in available_groups if search_term.lower() in g.lower()]
+                term = search_term.lower()
+                filtered_groups = [g for g in available_groups if term in groups_lower[g]]
                 print(f"🔍 Found {len(filtered_groups)} groups matching '{search_term}'")
             else:
                 filtered_groups = available_groups[:50]  # Show first 50 if no search
@@ -553,14 +685,17 @@ class TaskCreator:
     
     def _paginated_group_selection(self, available_groups: List[str], selected_groups: List[str]) -> bool:
         """Show groups in pages for selection"""
+        import inquirer
         page_size = 20
-        total_pages = (len(available_groups) + page_size - 1) // page_size
+        # Each page's checkbox choices, sliced once; navigating just indexes into this
+        pages = [available_groups[i:i + page_size] + ["← Back to page navigation"]
+                 for i in range(0, len(available_groups), page_size)]
+        total_pages = len(pages)
         current_page = 0
         
         while True:
             start_idx = current_page * page_size
             end_idx = min(start_idx + page_size, len(available_groups))
-            page_groups = available_groups[start_idx:end_idx]
             
             print(f"\n📋 Page {current_page + 1}/{total_pages} (Groups {start_idx + 1}-{end_idx})")
             
@@ -592,7 +727,7 @@ class TaskCreator:
                 questions = [
                     inquirer.Checkbox('groups',
                                      message=f"Select groups from page {current_page + 1}",
-                                     choices=page_groups + ["← Back to page navigation"])
+                                     choices=pages[current_page])
                 ]
                 
                 answers = inquirer.prompt(questions)
@@ -610,6 +745,7 @@ class TaskCreator:
 
     def _remove_selected_groups(self, selected_groups: List[str]) -> bool:
         """Remove groups from selected list"""
+        import inquirer
         if not selected_groups:
             print("❌ No selected groups to remove")
             return False
@@ -631,16 +767,16 @@ class TaskCreator:
         if "← Back to group menu" in answers['groups']:
             return False
         
-        # Remove selected groups
-        for group in answers['groups']:
-            if group in selected_groups:  # Safety check
-                selected_groups.remove(group)
+        # Remove selected groups in place, keeping the order of the rest
+        to_remove = set(answers['groups'])
+        selected_groups[:] = [g for g in selected_groups if g not in to_remove]
         
         print(f"✓ Removed {len(answers['groups'])} groups")
         return True
     
     def _remove_individual_login(self, removed_logins: List[str]) -> bool:
         """Remove individual login IDs from the query"""
+        import inquirer
         while True:
             print("\n🚫 Remove Individual Login IDs")
             print("Enter login IDs to exclude from the analysis")
@@ -682,23 +818,15 @@ class TaskCreator:
             if not answers or not answers['logins']:
                 continue
             
-            # Parse and validate login IDs
-            login_ids = [id.strip() for id in answers['logins'].split(',')]
-            valid_logins = []
-            
-            for login_id in login_ids:
-                if login_id.isdigit() and int(login_id) > 9999:
-                    valid_logins.append(int(login_id))
-                else:
-                    print(f"❌ Invalid login ID: {login_id} (must be > 9999)")
+            # Already validated by _validate_login_ids, so every entry parses
+            valid_logins = [int(login_id) for login_id in answers['logins'].split(',')]
             
             if valid_logins:
                 # Add to removed logins (avoid duplicates)
-                added_count = 0
-                for login in valid_logins:
-                    if login not in removed_logins:
-                        removed_logins.append(login)
-                        added_count += 1
+                already_removed = set(removed_logins)
+                added = [login for login in dict.fromkeys(valid_logins) if login not in already_removed]
+                removed_logins.extend(added)
+                added_count = len(added)
                 
                 print(f"✓ Added {added_count} new login(s) to removal list")
                 if added_count < len(valid_logins):
@@ -710,25 +838,15 @@ class TaskCreator:
     
     def _validate_login_ids(self, login_input: str) -> bool:
         """Validate login ID input"""
-        if not login_input.strip():
-            return False
-        
-        login_ids = [id.strip() for id in login_input.split(',')]
-        
-        for login_id in login_ids:
-            if not login_id.isdigit():
-                return False
-            if int(login_id) <= 9999:
-                return False
-        
-        return True
+        return _LOGIN_IDS_RE.fullmatch(login_input) is not None
     
     def select_login_range(self):
         """Interactive login range selection"""
+        import inquirer
         print("\n🔢 Getting login range information...")
         
         # Get suggested range
-        range_info = self.db_manager.get_login_range(self.selected_config['groups'])
+        range_info = self._get_login_range(self.selected_config['groups'])
         
         print(f"📈 Range info for selected criteria:")
         print(f"   Min Login: {range_info['min_login']:,}")
@@ -739,11 +857,11 @@ class TaskCreator:
             inquirer.Text('min_login',
                          message="Enter minimum login ID",
                          default=str(range_info['min_login']),
-                         validate=lambda _, x: x.isdigit() and int(x) >= 10000),
+                         validate=lambda _, x: _LOGIN_ID_RE.fullmatch(x) is not None),
             inquirer.Text('max_login',
                          message="Enter maximum login ID",
                          default=str(range_info['max_login']),
-                         validate=lambda _, x: x.isdigit() and int(x) >= 10000)
+                         validate=lambda _, x: _LOGIN_ID_RE.fullmatch(x) is not None)
         ]
         
         answers = inquirer.prompt(questions)
@@ -762,6 +880,7 @@ class TaskCreator:
     
     def select_report_type(self):
         """Interactive report type selection"""
+        import inquirer
         print("\n📋 Select report type...")
         
         report_choices = [
@@ -795,13 +914,14 @@ class TaskCreator:
     
     def select_additional_options(self):
         """Interactive additional options selection"""
+        import inquirer
         print("\n⚙️ Additional options...")
         
         questions = [
             inquirer.Text('limit',
                          message="Enter record limit (0 for no limit)",
                          default="100",
-                         validate=lambda _, x: x.isdigit())
+                         validate=lambda _, x: _DIGITS_RE.fullmatch(x) is not None)
         ]
         
         answers = inquirer.prompt(questions)
@@ -815,6 +935,7 @@ class TaskCreator:
     
     def show_configuration_summary(self):
         """Show final configuration summary"""
+        import inquirer
         print("\n" + "=" * 60)
         print("📋 TASK CONFIGURATION SUMMARY")
         print("=" * 60)
@@ -840,7 +961,7 @@ class TaskCreator:
             removed_display = f"{len(self.selected_config['removed_logins'])} logins excluded"
             config_table.append(["Removed Logins", removed_display])
         
-        print(tabulate(config_table, headers=["Setting", "Value"], tablefmt="grid"))
+        print(_render_kv_table(config_table, ["Setting", "Value"]))
         
         questions = [
             inquirer.Confirm('confirm',
@@ -860,62 +981,101 @@ class TaskCreator:
         
         print(f"\n🚀 Executing {len(commands)} command(s)...")
         
+        # The reports are independent, so the extra ones run as child processes alongside the
+        # first; only the first may use the in-process runner, which redirects this process's stdout
+        cmd_strs = [' '.join(cmd) for cmd in commands]
+        for i, cmd_str in enumerate(cmd_strs, 1):
+            print(f"📊 Running command {i}/{len(commands)}: {cmd_str}")
+        
+        outcomes = [None] * len(commands)
+        with ThreadPoolExecutor(max_workers=max(len(commands) - 1, 1)) as executor:
+            futures = {executor.submit(self._run_report, cmd, False): i for i, cmd in enumerate(commands[1:], 1)}
+            if commands:
+                in_process = self._inproc_reports and not self.scheduler.get_scheduler_status()['running']
+                outcomes[0] = self._run_report(commands[0], in_process)
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
+        
         # Store results for export
         execution_results = []
         
-        for i, cmd in enumerate(commands, 1):
-            print(f"\n📊 Running command {i}/{len(commands)}: {' '.join(cmd)}")
+        for i, (cmd_str, (result, error, timestamp)) in enumerate(zip(cmd_strs, outcomes), 1):
+            print(f"\n📊 Command {i}/{len(commands)}: {cmd_str}")
             print("-" * 50)
             
-            try:
-                # Capture output for export
-                result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
+            if error is not None:
+                print(f"❌ Error executing command {i}: {error}")
+                execution_results.append({
+                    'command': cmd_str,
+                    'output': str(error),
+                    'success': False,
+                    'timestamp': timestamp
+                })
+            elif result.returncode == 0:
+                print(f"✓ Command {i} completed successfully")
+                # Store successful results
+                execution_results.append({
+                    'command': cmd_str,
+                    'output': result.stdout,
+                    'success': True,
+                    'timestamp': timestamp
+                })
                 
-                if result.returncode == 0:
-                    print(f"✓ Command {i} completed successfully")
-                    # Store successful results
-                    execution_results.append({
-                        'command': ' '.join(cmd),
-                        'output': result.stdout,
-                        'success': True,
-                        'timestamp': datetime.now().isoformat()
-                    })
+                # Also print some output to console
+                if result.stdout:
+                    print(_output_preview(result.stdout))
                     
-                    # Also print some output to console
-                    if result.stdout:
-                        lines = result.stdout.strip().split('\n')
-                        # Show first 10 and last 10 lines if output is long
-                        if len(lines) > 20:
-                            print('\n'.join(lines[:10]))
-                            print(f"... ({len(lines)-20} more lines) ...")
-                            print('\n'.join(lines[-10:]))
-                        else:
-                            print(result.stdout)
-                        
-                else:
-                    print(f"❌ Command {i} failed with return code {result.returncode}")
-                    if result.stderr:
-                        print(f"Error: {result.stderr}")
-                    
-                    execution_results.append({
-                        'command': ' '.join(cmd),
-                        'output': result.stderr,
-                        'success': False,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    
-            except Exception as e:
-                print(f"❌ Error executing command {i}: {e}")
+            else:
+                print(f"❌ Command {i} failed with return code {result.returncode}")
+                if result.stderr:
+                    print(f"Error: {result.stderr}")
+                
                 execution_results.append({
-                    'command': ' '.join(cmd),
-                    'output': str(e),
+                    'command': cmd_str,
+                    'output': result.stderr,
                     'success': False,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': timestamp
                 })
         
         print(f"\n🎉 Task execution completed!")
         return execution_results
     
+    def _run_report(self, cmd: List[str], in_process: bool) -> Tuple[Optional[subprocess.CompletedProcess], Optional[Exception], str]:
+        """Run one report command; returns (result, error, finish timestamp)"""
+        try:
+            result = self._run_report_in_process(cmd) if in_process else None
+            if result is None:
+                result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
+            return result, None, datetime.now().isoformat()
+        except Exception as e:
+            return None, e, datetime.now().isoformat()
+    
+    def _run_report_in_process(self, cmd: List[str]) -> Optional[subprocess.CompletedProcess]:
+        """Run a report script's main() here, capturing output like subprocess.run; None if not importable"""
+        script, args = cmd[1], cmd[2:]
+        stdout, stderr = io.StringIO(), io.StringIO()
+        saved_argv = sys.argv
+        sys.argv = [script] + args
+        returncode = 0
+        try:
+            # Import under the redirect too, so the scripts' Windows stdout re-wrapping sees a
+            # plain buffer-less stream and leaves the CLI's own stdout alone
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    module = importlib.import_module(os.path.splitext(script)[0])
+                except (ImportError, SystemExit):
+                    return None
+                try:
+                    module.main()
+                except SystemExit as e:
+                    returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except Exception:
+                    traceback.print_exc()
+                    returncode = 1
+        finally:
+            sys.argv = saved_argv
+        return subprocess.CompletedProcess(cmd, returncode, stdout.getvalue(), stderr.getvalue())
+    
     def build_command(self) -> List[str]:
         """Build command based on configuration"""
         commands = []
@@ -949,6 +1109,7 @@ class TaskCreator:
     
     def handle_results_export(self, results: List[Dict]):
         """Handle exporting results to Excel and/or Telegram"""
+        import inquirer
         successful_results = [r for r in results if r['success']]
         
         if not successful_results:
@@ -986,24 +1147,19 @@ class TaskCreator:
         if "Telegram" in export_type and telegram_status['configured']:
             message = self.telegram.format_report_message(self.selected_config, successful_results)
             
-            # If we don't have an excel file yet, create a temporary one for Telegram
+            # Without an Excel export the workbook is only needed for the upload, so build it in memory
+            file_obj = None
             file_to_send = excel_filename
             if not file_to_send:
                 print("📊 Creating Excel file for Telegram...")
-                file_to_send = self.excel_exporter.export_results_to_xlsx(successful_results, self.selected_config)
+                file_obj = io.BytesIO()
+                file_to_send = self.excel_exporter.export_results_to_xlsx(successful_results, self.selected_config, sink=file_obj)
             
-            if file_to_send and os.path.exists(file_to_send):
+            # The exporter returns None when it fails, so a name means the workbook was written
+            if file_to_send:
                 print(f"📱 Sending to Telegram: {file_to_send}")
-                if self.telegram.send_telegram_message(message, file_to_send):
+                if self.telegram.send_telegram_message(message, file_to_send, file_obj=file_obj, filename=file_to_send):
                     print("✓ Results sent to Telegram successfully!")
-                    
-                    # If this was a temp file and we only sent to Telegram, clean it up
-                    if not excel_filename and "Excel" not in export_type:
-                        try:
-                            os.remove(file_to_send)
-                            print("🗑️ Temporary file cleaned up")
-                        except:
-                            pass
                 else:
                     print("❌ Failed to send results to Telegram")
             else:
@@ -1012,45 +1168,48 @@ class TaskCreator:
     def show_optimization_info(self):
         """Display current month optimization information"""
         now = datetime.now()
-        current_year = now.year
-        current_month = now.month
-        
-        # Calculate current month date range
-        month_start = datetime(current_year, current_month, 1)
-        if current_month == 12:
-            month_end = datetime(current_year + 1, 1, 1)
-        else:
-            month_end = datetime(current_year, current_month + 1, 1)
-        
-        print("\n" + "=" * 70)
-        print("🚀 PERFORMANCE OPTIMIZATION ACTIVE")
-        print("=" * 70)
-        print(f"📅 Current Month: {month_start.strftime('%B %Y')} (Month {current_month})")
-        print(f"📊 Date Range: {month_start.strftime('%Y-%m-%d')} to {(month_end - timedelta(days=1)).strftime('%Y-%m-%d')}")
-        print(f"⚡ Performance: Only querying current month data")
-        print(f"🎯 Optimization: Skipping all historical months")
-        print(f"🗄️ Database: {self.selected_config.get('database', 'N/A')}")
-        print("=" * 70)
+        database = self.selected_config.get('database', 'N/A')
+        key = (now.year, now.month, database)
+        block = self._opt_info_cache.get(key)
+        if block is None:
+            # Calculate current month date range
+            month_start = datetime(now.year, now.month, 1)
+            if now.month == 12:
+                month_end = datetime(now.year + 1, 1, 1)
+            else:
+                month_end = datetime(now.year, now.month + 1, 1)
+            month_last_day = month_end - timedelta(days=1)
+            
+            block = "\n".join([
+                "\n" + "=" * 70,
+                "🚀 PERFORMANCE OPTIMIZATION ACTIVE",
+                "=" * 70,
+                f"📅 Current Month: {month_start:%B %Y} (Month {now.month})",
+                f"📊 Date Range: {month_start:%Y-%m-%d} to {month_last_day:%Y-%m-%d}",
+                "⚡ Performance: Only querying current month data",
+                "🎯 Optimization: Skipping all historical months",
+                f"🗄️ Database: {database}",
+                "=" * 70,
+            ])
+            self._opt_info_cache[key] = block
+        print(block)
     
     def manage_scheduled_tasks(self):
         """Handle scheduled task management"""
+        import inquirer
         while True:
             status = self.scheduler.get_scheduler_status()
+            running = status['running']
             
             options = [
-                "📅 Create New Scheduled Task",
-                "📋 List All Scheduled Tasks",
-                "🚀 Execute Task Manually",
-                "🔄 Toggle Task (Enable/Disable)",
-                "🗑️ Delete Task",
-                "📊 Task Monitoring Dashboard",
-                "🟢 Start Scheduler" if not status['running'] else "🛑 Stop Scheduler",
+                *_SCHEDULED_TASK_OPTIONS,
+                "🛑 Stop Scheduler" if running else "🟢 Start Scheduler",
                 "← Back to Main Menu"
             ]
             
             questions = [
                 inquirer.List('action',
-                             message=f"📅 Scheduled Task Management (Scheduler: {'🟢 Running' if status['running'] else '🔴 Stopped'}, Active Tasks: {status['active_tasks']}/{status['total_tasks']})",
+                             message=f"📅 Scheduled Task Management (Scheduler: {'🟢 Running' if running else '🔴 Stopped'}, Active Tasks: {status['active_tasks']}/{status['total_tasks']})",
                              choices=options)
             ]
             
@@ -1084,6 +1243,7 @@ class TaskCreator:
     
     def create_scheduled_task_wizard(self):
         """Enhanced task creation wizard with better UI"""
+        import inquirer
         print("\n📅 Create New Scheduled Task")
         print("=" * 60)
         
@@ -1110,6 +1270,19 @@ class TaskCreator:
                 return False
         
         try:
+            # Saved configurations are listed up front so their picker joins the main prompt
+            saved_configs = self.scheduler.config_manager.load_all_configs()
+            config_choices = []
+            for name, config in saved_configs.items():
+                groups_info = f"{len(config.get('groups', []))} groups" if config.get('groups') else "All groups"
+                database = config.get('database', 'Unknown')
+                report_type = config.get('report_type', 'Unknown')
+                saved_dt = parse_saved_at(config.get('saved_at', ''))
+                date_str = f" ({saved_dt.strftime('%m/%d %H:%M')})" if saved_dt else ""
+                
+                choice_text = f"{name} - {database} - {groups_info} - {report_type}{date_str}"
+                config_choices.append((choice_text, name))
+            
             # Enhanced task creation with better validation
             questions = [
                 inquirer.Text('task_name', 
@@ -1126,6 +1299,10 @@ class TaskCreator:
                                  ('Monthly Financial Overview', 'Monthly Report'),
                                  ('Saved Configuration Report', 'Saved Configuration Report')
                              ]),
+                inquirer.List('config_name',
+                             message="Select saved configuration to use for scheduled reports",
+                             choices=config_choices,
+                             ignore=lambda a: not config_choices or a['report_type'] != 'Saved Configuration Report'),
                 inquirer.List('database', 
                              message="Target Database",
                              choices=[
@@ -1157,10 +1334,9 @@ class TaskCreator:
                 print("❌ Task creation cancelled")
                 return False
             
-            # If Saved Configuration Report selected, ask for configuration
+            # If Saved Configuration Report selected, use the configuration picked above
             saved_config_name = None
             if answers['report_type'] == 'Saved Configuration Report':
-                saved_configs = self.scheduler.config_manager.load_all_configs()
                 if not saved_configs:
                     print("❌ No saved configurations found!")
                     print("Please create a configuration first using 'Create New Report'.")
@@ -1179,37 +1355,7 @@ class TaskCreator:
                     else:
                         return False
                 
-                config_choices = []
-                for name, config in saved_configs.items():
-                    groups_info = f"{len(config.get('groups', []))} groups" if config.get('groups') else "All groups"
-                    database = config.get('database', 'Unknown')
-                    report_type = config.get('report_type', 'Unknown')
-                    saved_at = config.get('saved_at', '')
-                    
-                    # Format saved date
-                    date_str = ""
-                    if saved_at:
-                        try:
-                            saved_dt = datetime.fromisoformat(saved_at)
-                            date_str = f" ({saved_dt.strftime('%m/%d %H:%M')})"
-                        except:
-                            pass
-                    
-                    choice_text = f"{name} - {database} - {groups_info} - {report_type}{date_str}"
-                    config_choices.append((choice_text, name))
-                
-                config_question = [
-                    inquirer.List('config_name',
-                                 message="Select saved configuration to use for scheduled reports",
-                                 choices=config_choices)
-                ]
-                
-                config_answer = inquirer.prompt(config_question)
-                if not config_answer:
-                    print("❌ Configuration selection cancelled")
-                    return False
-                
-                saved_config_name = config_answer['config_name']
+                saved_config_name = answers['config_name']
                 selected_config = saved_configs[saved_config_name]
                 
                 print(f"\n✓ Selected configuration: {saved_config_name}")
@@ -1317,8 +1463,7 @@ This chat will receive automated reports according to the schedule above."""
             }
             
             # Save task
-            self.scheduler.tasks[answers['task_name']] = task
-            if self.scheduler._save_tasks():
+            if self.scheduler.add_task(task):
                 print(f"\n🎉 Task '{answers['task_name']}' created successfully!")
                 if answers['active']:
                     next_run = datetime.fromisoformat(task['next_run'])
@@ -1350,32 +1495,21 @@ This chat will receive automated reports according to the schedule above."""
     
     def _validate_time_format(self, _, time_str):
         """Validate time format HH:MM"""
-        try:
-            time_parts = time_str.split(':')
-            if len(time_parts) != 2:
-                return False
-            hour, minute = int(time_parts[0]), int(time_parts[1])
-            return 0 <= hour <= 23 and 0 <= minute <= 59
-        except:
-            return False
+        return _TIME_RE.fullmatch(time_str) is not None
     
     def execute_task_manually(self):
         """Execute a task manually with enhanced feedback"""
+        import inquirer
         if not self.scheduler.tasks:
             print("No tasks available.")
             return
         
         task_choices = []
+        last_run_dt = self.scheduler._last_run_dt  # parsed once when tasks load or run
         for task_name, task in self.scheduler.tasks.items():
             status = "🟢 Active" if task['active'] else "🔴 Inactive"
-            last_run = task.get('last_run')
-            last_run_str = ""
-            if last_run:
-                try:
-                    last_run_time = datetime.fromisoformat(last_run)
-                    last_run_str = f" (Last: {last_run_time.strftime('%m/%d %H:%M')})"
-                except:
-                    pass
+            last_run_time = last_run_dt.get(task_name)
+            last_run_str = f" (Last: {last_run_time.strftime('%m/%d %H:%M')})" if last_run_time else ""
             
             choice_text = f"{task_name} - {task['database']} - {status}{last_run_str}"
             task_choices.append((choice_text, task_name))
@@ -1410,6 +1544,8 @@ This chat will receive automated reports according to the schedule above."""
     
     def show_task_monitoring_dashboard(self):
         """Show an enhanced monitoring dashboard with health checks"""
+        import inquirer
+        from tabulate import tabulate
         while True:
             print("\n📊 Task Monitoring Dashboard")
             print("=" * 80)
@@ -1453,8 +1589,11 @@ This chat will receive automated reports according to the schedule above."""
                     else:
                         time_str = f"in {time_until.seconds//60}m"
                     print(f"   • Next Execution: {next_exec_str} ({time_str})")
+                elif status['running']:
+                    print(f"   • Next Execution: {next_exec_str} (⏳ Due now)")
                 else:
-                    print(f"   • Next Execution: {next_exec_str} (⚠️ Overdue)")
+                    # Slots more than a minute late are skipped once the scheduler starts
+                    print(f"   • Next Execution: {next_exec_str} (⚠️ Missed, scheduler stopped)")
             
             if stats['last_execution']:
                 last_exec_str = stats['last_execution'].strftime('%Y-%m-%d %H:%M:%S')
@@ -1488,8 +1627,10 @@ This chat will receive automated reports according to the schedule above."""
                                 time_until = f"{minutes}m"
                             else:
                                 time_until = "< 1m"
+                        elif status['running']:
+                            time_until = "Due now"
                         else:
-                            time_until = "Overdue!"
+                            time_until = "Missed"
                     except:
                         pass
                 
@@ -1529,19 +1670,18 @@ This chat will receive automated reports according to the schedule above."""
             
             # Recent activity with more details
             recent_activities = []
-            for task_name, task in self.scheduler.tasks.items():
-                if task.get('last_run'):
-                    try:
-                        last_run = datetime.fromisoformat(task['last_run'])
-                        recent_activities.append({
-                            'task': task_name,
-                            'time': last_run,
-                            'success': task.get('last_error') is None,
-                            'database': task['database'],
-                            'chat_id': task['chat_id']
-                        })
-                    except:
-                        pass
+            # Snapshot: executor threads add entries when a task first runs
+            for task_name, last_run in list(self.scheduler._last_run_dt.items()):
+                task = self.scheduler.tasks.get(task_name)
+                if task is None:
+                    continue
+                recent_activities.append({
+                    'task': task_name,
+                    'time': last_run,
+                    'success': task.get('last_error') is None,
+                    'database': task['database'],
+                    'chat_id': task['chat_id']
+                })
             
             if recent_activities:
                 recent_activities.sort(key=lambda x: x['time'], reverse=True)
@@ -1586,6 +1726,7 @@ This chat will receive automated reports according to the schedule above."""
     
     def _execute_unhealthy_task(self):
         """Execute an unhealthy task manually"""
+        import inquirer
         health_report = self.scheduler.get_task_health_report()
         unhealthy_tasks = [h for h in health_report if '🔴' in h['health_status']]
         
@@ -1613,6 +1754,7 @@ This chat will receive automated reports according to the schedule above."""
     
     def _show_detailed_task_info(self):
         """Show detailed information about a specific task"""
+        import inquirer
         if not self.scheduler.tasks:
             print("No tasks available.")
             return
@@ -1682,6 +1824,8 @@ This chat will receive automated reports according to the schedule above."""
     
     def _task_quick_actions(self):
         """Quick actions for task management"""
+        import inquirer
+        from tabulate import tabulate
         if not self.scheduler.tasks:
             print("No tasks available.")
             return
@@ -1718,9 +1862,11 @@ This chat will receive automated reports according to the schedule above."""
                 count = 0
                 for task_name, task in self.scheduler.tasks.items():
                     if task['active'] != enable_all:
-                        task['active'] = enable_all
+                        self.scheduler._set_active(task_name, enable_all)
                         if enable_all:
-                            task['next_run'] = self.scheduler._calculate_next_run(task['send_time'], task['frequency'])
+                            self.scheduler._set_next_run(task_name, self.scheduler._calculate_next_run(task['send_time'], task['frequency']))
+                        self.scheduler._mark_dirty(task_name)
+                        self.scheduler._rearm_task(task_name)
                         count += 1
                 
                 if self.scheduler._save_tasks():
@@ -1762,10 +1908,11 @@ This chat will receive automated reports according to the schedule above."""
             
             if confirm_answer and confirm_answer['confirm']:
                 count = 0
-                for task in self.scheduler.tasks.values():
+                for task_name, task in self.scheduler.tasks.items():
                     if task.get('last_error'):
                         task['last_error'] = None
                         task['error_count'] = 0
+                        self.scheduler._mark_dirty(task_name)
                         count += 1
                 
                 if self.scheduler._save_tasks():
@@ -1844,17 +1991,12 @@ def main():
     except Exception as e:
         print(f"❌ Unexpected error in main: {e}")
     finally:
-        # Ensure scheduler is properly stopped
+        # Stop the scheduler, wait for in-flight runs and flush their pending saves
         if task_creator and hasattr(task_creator, 'scheduler'):
             try:
-                status = task_creator.scheduler.get_scheduler_status()
-                if status['running']:
+                if task_creator.scheduler.get_scheduler_status()['running']:
                     print("🛑 Stopping scheduler before exit...")
-                    task_creator.scheduler.stop_scheduler_service()
-                    import time
-                    time.sleep(2)  # Give scheduler time to stop
-            except AttributeError:
-                print("⚠️ Scheduler does not have get_scheduler_status method")
+                task_creator.scheduler.close()
             except Exception as e:
                 print(f"⚠️ Error stopping scheduler: {e}")
         print("👋 Goodbye!")
@@ -7,9 +7,10 @@ Handles all Telegram bot functionality for sending reports
 import os
 import json
 import asyncio
+import concurrent.futures
+import threading
 from datetime import datetime
 from typing import Optional
-import inquirer
 from telegram import Bot
 from telegram.error import TelegramError
 
@@ -21,6 +22,8 @@ class TelegramIntegration:
         self.telegram_bot = None
         self.telegram_chat_id = None
         self.chat_configs = {}  # Multiple chat configurations
+        self._send_loop = None
+        self._send_loop_lock = threading.Lock()
         self._ensure_config_dir()
         self._load_telegram_config()
     
@@ -79,6 +82,7 @@ class TelegramIntegration:
     
     def setup_telegram_integration(self):
         """Setup Telegram bot integration"""
+        import inquirer
         print("\n🤖 Telegram Bot Integration Setup")
         print("=" * 50)
         print("To use Telegram integration, you need:")
@@ -160,8 +164,9 @@ class TelegramIntegration:
                 'status': 'Not configured'
             }
     
-    def send_telegram_message(self, message: str, file_path: str = None, chat_id: str = None):
-        """Send message and optionally file to Telegram"""
+    def send_telegram_message(self, message: str, file_path: str = None, chat_id: str = None,
+                              file_obj=None, filename: str = None):
+        """Send message and optionally file (path or in-memory file object) to Telegram"""
         if not self.telegram_bot:
             print("❌ Telegram bot not configured")
             return False
@@ -174,72 +179,42 @@ class TelegramIntegration:
             return False
         
         try:
-            # Use a completely separate thread with its own event loop
-            import threading
-            import queue
-            
-            result_queue = queue.Queue()
-            
-            def telegram_thread():
-                try:
-                    # Create completely new event loop for this thread
-                    import asyncio
-                    
-                    # Check if there's already an event loop running
-                    try:
-                        loop = asyncio.get_running_loop()
-                        print("[>>] Using existing event loop in thread")
-                    except RuntimeError:
-                        # No loop running, create a new one
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        print("[>>] Created new event loop in thread")
-                    
-                    try:
-                        result = loop.run_until_complete(
-                            self._send_message_and_file_sync(message, file_path, target_chat_id)
-                        )
-                        result_queue.put(('success', result))
-                    except Exception as e:
-                        print(f"❌ Loop execution error: {e}")
-                        result_queue.put(('error', str(e)))
-                    finally:
-                        # Only close the loop if we created it
-                        if loop.is_running():
-                            try:
-                                loop.close()
-                            except RuntimeError:
-                                pass  # Loop may already be closed
-                        
-                except Exception as e:
-                    print(f"❌ Thread setup error: {e}")
-                    result_queue.put(('error', str(e)))
-            
-            # Start thread and wait for result
-            thread = threading.Thread(target=telegram_thread)
-            thread.daemon = True  # Make thread daemon so it doesn't block shutdown
-            thread.start()
-            thread.join(timeout=30)  # 30 second timeout
-            
-            # Get result
-            try:
-                result_type, result_value = result_queue.get_nowait()
-                if result_type == 'success':
-                    return result_value
-                else:
-                    print(f"❌ Telegram thread error: {result_value}")
-                    return False
-            except queue.Empty:
-                print("❌ Telegram operation timed out")
-                return False
-            
-        except Exception as e:
-            print(f"❌ Error setting up Telegram thread: {e}")
+            return self._run_on_send_loop(
+                self._send_message_and_file_sync(message, file_path, target_chat_id,
+                                                 file_obj, filename)
+            )
+        except concurrent.futures.TimeoutError:
+            print("❌ Telegram operation timed out")
             return False
-            print(f"❌ Error setting up Telegram thread: {e}")
+        except Exception as e:
+            print(f"❌ Telegram send error: {e}")
             return False
     
-    async def _send_message_and_file_sync(self, message: str, file_path: str = None, chat_id: str = None):
+    def _get_send_loop(self):
+        """Return the background event loop that owns the bot's HTTP connections"""
+        with self._send_loop_lock:
+            if self._send_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="telegram-send", daemon=True)
+                thread.start()
+                self._send_loop = loop
+            return self._send_loop
+    
+    def _run_on_send_loop(self, coro, timeout: float = 30):
+        """Run a bot coroutine on the shared loop and wait for its result.
+        
+        All bot calls go through one long-lived loop so the bot's HTTP client keeps
+        its connection alive instead of reconnecting on a fresh loop per send.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_send_loop())
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+    
+    async def _send_message_and_file_sync(self, message: str, file_path: str = None, chat_id: str = None,
+                                          file_obj=None, filename: str = None):
         """Async helper to send message and file in isolated event loop"""
         try:
             target_chat_id = chat_id or self.telegram_chat_id
@@ -255,8 +230,23 @@ class TelegramIntegration:
             
             print("✅ Message sent successfully")
             
+            # Send in-memory file if provided
+            if file_obj is not None:
+                print(f"📎 Sending file: {filename}")
+                try:
+                    file_obj.seek(0)
+                    await self.telegram_bot.send_document(
+                        chat_id=target_chat_id,
+                        document=file_obj,
+                        filename=filename,
+                        caption=f"📊 Financial Report: {filename}"
+                    )
+                    print("✅ File sent successfully")
+                except Exception as e:
+                    print(f"❌ Error sending file: {e}")
+            
             # Send file if provided
-            if file_path and os.path.exists(file_path):
+            elif file_path and os.path.exists(file_path):
                 print(f"📎 Sending file: {file_path}")
                 try:
                     with open(file_path, 'rb') as file:
@@ -294,7 +284,7 @@ class TelegramIntegration:
                      f"💬 Chat ID: {self.telegram_chat_id}\n\n" \
                      f"✅ Connection is working properly!"
             
-            return asyncio.run(self.telegram_bot.send_message(
+            return self._run_on_send_loop(self.telegram_bot.send_message(
                 chat_id=self.telegram_chat_id,
                 text=message,
                 parse_mode='HTML'
@@ -316,6 +306,7 @@ class TelegramIntegration:
     
     def manage_telegram_settings(self):
         """Manage Telegram integration settings"""
+        import inquirer
         while True:
             status = self.get_telegram_status()
             
@@ -366,6 +357,7 @@ class TelegramIntegration:
     
     def _send_custom_test_message(self):
         """Send a custom test message"""
+        import inquirer
         questions = [
             inquirer.Text('message',
                          message="Enter test message to send",
@@ -382,6 +374,7 @@ class TelegramIntegration:
     
     def _remove_telegram_config(self):
         """Remove Telegram configuration"""
+        import inquirer
         questions = [
             inquirer.Confirm('confirm',
                            message="Are you sure you want to remove Telegram configuration?",
@@ -508,6 +501,7 @@ class TelegramIntegration:
     
     def manage_chat_configurations(self):
         """Manage multiple chat configurations"""
+        import inquirer
         while True:
             print("\n📱 Chat Configuration Management")
             print("=" * 50)
@@ -552,6 +546,7 @@ class TelegramIntegration:
     
     def _add_chat_config_interactive(self):
         """Interactive chat configuration addition"""
+        import inquirer
         print("\n➕ Add New Chat Configuration")
         print("-" * 30)
         
@@ -583,7 +578,7 @@ class TelegramIntegration:
                 print(f"\n🔍 Testing chat ID {chat_id}...")
                 try:
                     test_message = f"🧪 Test message for chat configuration '{name}'"
-                    success = asyncio.run(self.telegram_bot.send_message(
+                    success = self._run_on_send_loop(self.telegram_bot.send_message(
                         chat_id=chat_id,
                         text=test_message
                     ))
@@ -610,6 +605,7 @@ class TelegramIntegration:
     
     def _remove_chat_config_interactive(self, chat_names):
         """Interactive chat configuration removal"""
+        import inquirer
         questions = [
             inquirer.List('name',
                          message="Select chat configuration to remove",
@@ -658,6 +654,7 @@ class TelegramIntegration:
     
     def _test_chat_config_interactive(self, chat_names):
         """Interactive chat configuration testing"""
+        import inquirer
         questions = [
             inquirer.List('name',
                          message="Select chat configuration to test",
@@ -677,7 +674,7 @@ class TelegramIntegration:
                              f"📅 Test Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" \
                              f"✅ This chat configuration is working properly!"
                     
-                    success = asyncio.run(self.telegram_bot.send_message(
+                    success = self._run_on_send_loop(self.telegram_bot.send_message(
                         chat_id=chat_id,
                         text=message,
                         parse_mode='HTML'
@@ -695,6 +692,7 @@ class TelegramIntegration:
     
     def select_chat_for_report(self):
         """Interactive chat selection for report sending"""
+        import inquirer
         if not self.chat_configs and not self.telegram_chat_id:
             print("❌ No chat configurations available")
             return None